@@ -1,8 +1,15 @@
+import os
+import ast
+import csv
+import sys
+import json
 import time
 import pprint
 from faker import Faker
 import argparse
 
+from .sensor_base import to_records
+
 # =========================================================
 #                       G L O B A L S
 # =========================================================
@@ -38,6 +45,144 @@ _SENSOR_ATTRIBS_ = {
     }
 }
 
+_FORMATS_ = ['pretty', 'jsonl', 'csv', 'binary']
+_SENSOR_COL_: str = 'sensor'       # Added to 'jsonl'/'csv' output when reading several sensors
+
+_SERVER_ATTRIBS_ = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'speedtest': {
+        'refresh': 3600,            # Seconds between sensor reads
+        'retention': 168,           # Number of records to keep in memory
+    },
+    'sensehat': {
+        'refresh': 10,
+        'retention': 8640,
+    }
+}
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _parse_setting(item) -> tuple:
+    """Parse 'key=value' setting, where value is a Python literal (e.g. '5', 'True', '[1, 2]') or a string."""
+    key, sep, val = item.partition('=')
+    if not sep or not key.strip():
+        raise argparse.ArgumentTypeError("'{}' is not a valid 'key=value' setting".format(item))
+
+    val = val.strip()
+    if val.lower() in ('true', 'false'):
+        return key.strip(), val.lower() == 'true'
+
+    try:
+        return key.strip(), ast.literal_eval(val)
+    except (ValueError, SyntaxError):
+        return key.strip(), val
+
+
+def _init_sensor(name, overrides=None):
+    settings = {**_SENSOR_ATTRIBS_[name], **(overrides or {})}
+
+    if name == 'speedtest':
+        from .sensor_SpeedTest import Sensor
+        return Sensor(settings)
+
+    elif name == 'sensehat':
+        from .sensor_SenseHat import Sensor
+        return Sensor(settings)
+
+    return None
+
+
+def _make_writer(fmt, sensors):
+    """
+    Create function that writes a record to stdout in given format.
+
+    Each record is flushed as soon as it's written, so output can be piped
+    into other tools (e.g. 'jq' or 'awk') in real time.
+    """
+    multi = len(sensors) > 1
+
+    if fmt == 'binary':
+        from .codec_Binary import Encoder
+
+        encoders = {name: Encoder(sensor.fields) for name, sensor in sensors.items()}
+
+        def write(name, record):
+            sys.stdout.buffer.write(encoders[name].encode(record))
+            sys.stdout.buffer.flush()
+
+    elif fmt == 'csv':
+        fields = {_SENSOR_COL_: None} if multi else {}
+        for sensor in sensors.values():
+            fields.update(sensor.fields)
+
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(fields), extrasaction='ignore')
+        writer.writeheader()
+
+        def write(name, record):
+            writer.writerow({_SENSOR_COL_: name, **record} if multi else record)
+            sys.stdout.flush()
+
+    elif fmt == 'jsonl':
+        def write(name, record):
+            sys.stdout.write(json.dumps({_SENSOR_COL_: name, **record} if multi else record, default=str) + '\n')
+            sys.stdout.flush()
+
+    else:
+        def write(name, record):
+            pp.pprint(record)
+            sys.stdout.flush()
+
+    return write
+
+
+def _stream(names, args, overrides):
+    sensors = {name: _init_sensor(name, overrides) for name in names}
+    write = _make_writer(args.format, sensors)
+
+    # Sensors are read one record at a time (rather than 'repeat' at once) so
+    # each record is written right away. Each sensor keeps its own schedule,
+    # so its limits (e.g. min 'holdTime' for SpeedTest) and adaptive sampling
+    # rate (SenseHat) still apply. Count of 'None' means until interrupted.
+    jobs = []
+    for name, sensor in sensors.items():
+        settings = {**_SENSOR_ATTRIBS_[name], **overrides}
+        count = sensor.limit_repeat(args.count if args.count is not None else settings['repeat']) or None
+        interval = args.interval if args.interval is not None else settings['holdTime']
+        jobs.append([time.monotonic(), name, count, interval])
+
+    while jobs:
+        jobs.sort(key=lambda job: job[0])
+        due, name, count, interval = jobs[0]
+        time.sleep(max(due - time.monotonic(), 0))
+
+        sensor = sensors[name]
+        for record in to_records(sensor.get_data({'repeat': 1})):
+            write(name, record)
+
+        if count is not None and count <= 1:
+            jobs.pop(0)
+        else:
+            jobs[0] = [due + sensor.hold_time(interval), name, None if count is None else count - 1, interval]
+
+
+def _serve(names, args, overrides):
+    from .server_HTTP import Server, Collector
+
+    collectors = [
+        Collector(
+            _init_sensor(name, overrides),
+            refresh=args.refresh or _SERVER_ATTRIBS_[name]['refresh'],
+            retention=args.retention or _SERVER_ATTRIBS_[name]['retention']
+        )
+        for name in names
+    ]
+    server = Server(collectors, host=args.host, port=args.port)
+    print("Serving '{}' on http://{}:{}/ ...".format(', '.join(names), args.host, args.port))
+    server.serve()
+
 
 # =========================================================
 #                  C L I   P A R S E R
@@ -47,38 +192,104 @@ def shell():
         description="Collect data from sensors via 'sensorMod' module",
         epilog="NOTE: Only call a module if the corresponding hardware/driver is installed"
     )
+    parser.add_argument(
+        'mode',
+        nargs='?',
+        default='get',
+        choices=['get', 'serve'],
+        help="'get' data and print it, or 'serve' latest/recent data via local HTTP server"
+    )
     parser.add_argument(
         '--sensor',
-        action='store',
+        action='append',
         type=str,
         required=True,
-        help="Sensor module to use"
+        help="Sensor module to use (can be supplied multiple times)"
+    )
+    parser.add_argument(
+        '--host',
+        action='store',
+        type=str,
+        default=_SERVER_ATTRIBS_['host'],
+        help="Address for HTTP server to listen on ('serve' mode only)"
+    )
+    parser.add_argument(
+        '--port',
+        action='store',
+        type=int,
+        default=_SERVER_ATTRIBS_['port'],
+        help="Port for HTTP server to listen on ('serve' mode only)"
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store',
+        type=float,
+        help="Seconds between sensor reads ('serve' mode only, default depends on sensor)"
+    )
+    parser.add_argument(
+        '--retention',
+        action='store',
+        type=int,
+        help="Number of records to keep per sensor ('serve' mode only, default depends on sensor)"
+    )
+    parser.add_argument(
+        '--format',
+        action='store',
+        type=str,
+        default='pretty',
+        choices=_FORMATS_,
+        help="Output format ('get' mode only): 'pretty' print, JSON lines, CSV, or binary (see 'codec_Binary')"
+    )
+    parser.add_argument(
+        '--count',
+        action='store',
+        type=int,
+        help="Number of times to read each sensor, 0 to read until interrupted ('get' mode only, default is 'repeat', "
+             "and sensor limits apply)"
+    )
+    parser.add_argument(
+        '--interval',
+        action='store',
+        type=float,
+        help="Seconds between sensor reads ('get' mode only, default is 'holdTime', sensor limits and "
+             "adaptive sampling rate apply)"
+    )
+    parser.add_argument(
+        '--set',
+        action='append',
+        type=_parse_setting,
+        default=[],
+        metavar='KEY=VALUE',
+        help="Override sensor setting, e.g. '--set tempUnit=F' (can be supplied multiple times)"
     )
 
     args = parser.parse_args()
-    sensor = None
 
-    if args.sensor not in _SENSOR_ATTRIBS_:
-        print("ERROR: '{}' is not a valid sensor module!".format(args.sensor))
-        exit(1)
+    for name in args.sensor:
+        if name not in _SENSOR_ATTRIBS_:
+            print("ERROR: '{}' is not a valid sensor module!".format(name), file=sys.stderr)
+            exit(1)
 
-    if args.sensor == 'speedtest':
-        from .sensor_SpeedTest import Sensor
-        sensor = Sensor(_SENSOR_ATTRIBS_[args.sensor])
+    overrides = dict(args.set)
 
-    elif args.sensor == 'sensehat':
-        from .sensor_SenseHat import Sensor
-        sensor = Sensor(_SENSOR_ATTRIBS_[args.sensor])
+    if args.mode == 'serve':
+        _serve(args.sensor, args, overrides)
+        return
 
-    data = sensor.get_data()
-    pp.pprint(data)
+    _stream(args.sensor, args, overrides)
 
 
+# Messages go to 'stderr' so they don't mix with records piped from 'stdout'.
 try:
     shell()
 
 except KeyboardInterrupt:
-    print('\nCancelling...')
+    print('\nCancelling...', file=sys.stderr)
+
+except BrokenPipeError:
+    # Reader (e.g. 'head') closed the pipe. Point 'stdout' at 'devnull' so that
+    # Python doesn't complain again when it flushes 'stdout' on exit.
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
 except Exception as e:
-    print('ERROR: {}'.format(e))
+    print('ERROR: {}'.format(e), file=sys.stderr)
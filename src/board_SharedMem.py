@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import struct
+import warnings
+from multiprocessing import shared_memory, resource_tracker
+
+from .sensor_base import to_records, to_epoch, from_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_MAGIC_:   bytes = b'SMLV'
+_VERSION_: int = 2
+
+# (magic, version, layout length, payload size, sequence number, publisher PID)
+_HEADER_ = struct.Struct('<4sIIIQI')
+_SEQ_ = struct.Struct('<Q')
+_SEQ_OFFSET_: int = 16
+
+_TS_FIELD_:     str = 'timestamp'
+_STR_SIZE_:     int = 64            # Default bytes per 'strIDX' slot (i.e. max 63 bytes of UTF-8)
+_MAX_STR_SIZE_: int = 256           # Max bytes per slot (as length is stored in 1 byte)
+_PREFIX_:    str = 'sensorMod_'     # Default block name is prefix + sensor type
+_RETRIES_:   int = 1000             # Max attempts to get a consistent read
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _align(offset, size=8) -> int:
+    return (offset + size - 1) // size * size
+
+
+def _layout(fields, strSizes) -> tuple:
+    """Get payload struct and ordered field list for a field map."""
+    hasTS = _TS_FIELD_ in fields
+    floatFlds = [fld for fld, typ in fields.items() if typ == 'float']
+    strFlds = [fld for fld, typ in fields.items() if typ == 'strIDX' and fld != _TS_FIELD_]
+    payload = struct.Struct(
+        '<' + ('d' if hasTS else '') + 'd' * len(floatFlds) + ''.join(f'{strSizes[fld]}p' for fld in strFlds)
+    )
+
+    return payload, hasTS, floatFlds, strFlds
+
+
+def _is_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True     # Process exists, but belongs to another user
+
+    return True
+
+
+def _check_stale(name):
+    """Unlink block left behind by a publisher that is no longer running, or raise 'FileExistsError'."""
+    shm = _attach(name)
+    try:
+        if shm.size < _HEADER_.size:
+            raise FileExistsError(f"Shared memory block '{name}' is in use and not a sensor board!")
+
+        magic, version, _, _, _, pid = _HEADER_.unpack_from(shm.buf, 0)
+        if magic != _MAGIC_ or version != _VERSION_:
+            raise FileExistsError(f"Shared memory block '{name}' is in use and not a sensor board!")
+        if _is_alive(pid):
+            raise FileExistsError(f"Shared memory block '{name}' is in use by publisher (PID {pid})!")
+    finally:
+        shm.close()
+
+    shm.unlink()
+
+
+def _attach(name):
+    # Only the publisher owns (and unlinks) the block. Before Python 3.13,
+    # attaching also registers the block with the resource tracker, which
+    # would then unlink it when the reader process exits.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N S
+# =========================================================
+class Publisher:
+    """
+    Publish latest sensor record to a shared memory block.
+
+    The block has a fixed layout derived from the sensor '_FIELD_MAP_'
+    (i.e. header, field map as JSON, and a packed record) and is protected by
+    a seqlock: the sequence number is odd while a record is being written.
+    Only one publisher may write to a given block. A block left behind by a
+    publisher that is no longer running is taken over, but a block that
+    belongs to a running publisher is not.
+
+    Each 'strIDX' field gets a fixed-size slot ('strSize' bytes, either for all
+    fields or as a dict per field). Longer values are cut (on a character
+    boundary) to fit, with a warning the first time it happens for a field.
+
+    Raises:
+        FileExistsError: If block is in use by another publisher.
+        ValueError: If a string slot size is invalid.
+    """
+    def __init__(self, fields, name, strSize=_STR_SIZE_):
+        strFlds = [fld for fld, typ in fields.items() if typ == 'strIDX' and fld != _TS_FIELD_]
+        strSizes = {
+            fld: strSize.get(fld, _STR_SIZE_) if isinstance(strSize, dict) else strSize
+            for fld in strFlds
+        }
+        for fld, size in strSizes.items():
+            if not 2 <= size <= _MAX_STR_SIZE_:
+                raise ValueError(f"Invalid string slot size '{size}' for '{fld}'!")
+
+        self._payload, self._hasTS, self._floatFlds, self._strFlds = _layout(fields, strSizes)
+        self._maxLen = [strSizes[fld] - 1 for fld in self._strFlds]
+        self._warned = set()
+
+        layout = json.dumps({'fields': fields, 'strSizes': strSizes}, separators=(',', ':')).encode()
+        self._offset = _align(_HEADER_.size + len(layout))
+        size = self._offset + self._payload.size
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            _check_stale(name)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self._buf = self._shm.buf
+        self._seq = 0
+        self._buf[_HEADER_.size:_HEADER_.size + len(layout)] = layout
+        _HEADER_.pack_into(self._buf, 0, _MAGIC_, _VERSION_, len(layout), self._payload.size, self._seq, os.getpid())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+    @classmethod
+    def for_sensor(cls, sensor, name=None, strSize=_STR_SIZE_):
+        """Create publisher for sensor. Default block name is 'sensorMod_<sensor type>'."""
+        return cls(sensor.fields, name or f"{_PREFIX_}{sensor.type}", strSize)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def sequence(self):
+        return self._seq
+
+    def _encode(self, fld, maxLen, inVal) -> bytes:
+        if inVal is None:
+            return b''
+
+        raw = str(inVal).encode()
+        if len(raw) <= maxLen:
+            return raw
+
+        if fld not in self._warned:
+            self._warned.add(fld)
+            warnings.warn(f"Value for '{fld}' is too long for {maxLen + 1} byte slot and is truncated!")
+
+        # Cut on a character boundary, so readers always get valid UTF-8
+        return raw[:maxLen].decode(errors='ignore').encode()
+
+    def publish(self, data):
+        """
+        Write latest record to shared memory.
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()'),
+                  in which case the last record is published.
+        """
+        records = to_records(data)
+        if not records:
+            return
+
+        rec = records[-1]
+        row = [to_epoch(rec[_TS_FIELD_])] if self._hasTS else []
+        row += [float('nan') if rec.get(fld) is None else rec[fld] for fld in self._floatFlds]
+        row += [self._encode(fld, maxLen, rec.get(fld)) for fld, maxLen in zip(self._strFlds, self._maxLen)]
+
+        self._seq += 1
+        _SEQ_.pack_into(self._buf, _SEQ_OFFSET_, self._seq)
+        self._payload.pack_into(self._buf, self._offset, *row)
+        self._seq += 1
+        _SEQ_.pack_into(self._buf, _SEQ_OFFSET_, self._seq)
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.release()
+            self._buf = None
+            self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+
+class Reader:
+    """
+    Read latest sensor record from a block written by 'Publisher'.
+
+    Reads never block the publisher or other readers. If the publisher is in
+    the middle of writing a record, the reader simply tries again.
+    """
+    def __init__(self, name):
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+
+        magic, version, layoutLen, payloadSize, _, _ = _HEADER_.unpack_from(self._buf, 0)
+        if magic != _MAGIC_ or version != _VERSION_:
+            self.close()
+            raise ValueError(f"Shared memory block '{name}' is not a sensor board!")
+
+        layout = json.loads(bytes(self._buf[_HEADER_.size:_HEADER_.size + layoutLen]))
+        self._flds = layout['fields']
+        self._payload, self._hasTS, self._floatFlds, self._strFlds = _layout(self._flds, layout['strSizes'])
+        self._offset = _align(_HEADER_.size + layoutLen)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def for_sensor(cls, sensorType, name=None):
+        return cls(name or f"{_PREFIX_}{sensorType}")
+
+    @property
+    def fields(self):
+        return self._flds
+
+    @property
+    def sequence(self):
+        """Sequence number of latest record (changes on every publish)."""
+        return _SEQ_.unpack_from(self._buf, _SEQ_OFFSET_)[0]
+
+    def read(self):
+        """
+        Get latest record.
+
+        Returns:
+            Tuple with sequence number and record dict. Record is 'None' if
+            nothing has been published yet.
+
+        Raises:
+            TimeoutError: If a consistent record could not be read.
+        """
+        start, end = self._offset, self._offset + self._payload.size
+        for _ in range(_RETRIES_):
+            seqBefore = _SEQ_.unpack_from(self._buf, _SEQ_OFFSET_)[0]
+            if seqBefore % 2:
+                time.sleep(0)
+                continue
+
+            raw = bytes(self._buf[start:end])
+            if _SEQ_.unpack_from(self._buf, _SEQ_OFFSET_)[0] == seqBefore:
+                break
+        else:
+            raise TimeoutError("Unable to get consistent record from shared memory!")
+
+        if seqBefore == 0:
+            return seqBefore, None
+
+        row = iter(self._payload.unpack(raw))
+        rec = {_TS_FIELD_: from_epoch(next(row))} if self._hasTS else {}
+        for fld in self._floatFlds:
+            val = next(row)
+            rec[fld] = None if val != val else val
+        for fld in self._strFlds:
+            val = next(row)
+            rec[fld] = val.decode() if val else None
+
+        return seqBefore, rec
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.release()
+            self._buf = None
+            self._shm.close()
@@ -0,0 +1,316 @@
+import json
+import math
+import zlib
+import struct
+from datetime import datetime, timedelta
+
+from .sensor_base import to_records
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_MAGIC_:   bytes = b'SM'
+_VERSION_: int = 1
+
+_FRAME_HDR_ = struct.Struct('<2sBBI')   # (magic, version, frame type, payload length)
+_SCHEMA_ID_ = struct.Struct('<I')
+_BATCH_HDR_ = struct.Struct('<IH')      # (schema ID, number of rows)
+_STRING_HDR_ = struct.Struct('<HHH')    # (field slot, code, length of UTF-8 string)
+
+_FRAME_SCHEMA_:  int = 1
+_FRAME_STRINGS_: int = 2
+_FRAME_BATCH_:   int = 3
+
+_TS_FIELD_: str = 'timestamp'
+_PRECISION_ = {
+    'f4': 'f',                          # 32-bit floats (default, enough for e.g. noisy IMU values)
+    'f8': 'd',                          # 64-bit floats (exact for epoch seconds like 'dt')
+}
+_DEFAULT_PRECISION_: str = 'f4'
+_EPOCH_FIELDS_ = ('dt', 'sunrise', 'sunset')    # Float fields that hold epoch seconds and default to 'f8'
+
+_NONE_CODE_: int = 0                    # String code reserved for 'None'
+_MAX_CODE_:  int = 0xFFFF
+_MAX_BATCH_: int = 0xFFFF
+
+_EPOCH_ = datetime(1970, 1, 1)
+_ONE_USEC_ = timedelta(microseconds=1)
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _to_usec(ts) -> int:
+    # Timestamps are sent as int64 microseconds since epoch (UTC) instead of
+    # ISO strings, as they are unique per record and won't benefit from interning.
+    if isinstance(ts, (int, float)):
+        return round(ts * 1_000_000)
+
+    stamp = datetime.fromisoformat(str(ts).replace('Z', '+00:00'))
+    if stamp.tzinfo is not None:
+        stamp = (stamp - stamp.utcoffset()).replace(tzinfo=None)
+
+    return (stamp - _EPOCH_) // _ONE_USEC_
+
+
+def _from_usec(usec) -> str:
+    return (_EPOCH_ + timedelta(microseconds=usec)).isoformat()
+
+
+def _default_precision(fld) -> str:
+    return 'f8' if fld in _EPOCH_FIELDS_ else _DEFAULT_PRECISION_
+
+
+def _frame(frameType, payload) -> bytes:
+    return _FRAME_HDR_.pack(_MAGIC_, _VERSION_, frameType, len(payload)) + payload
+
+
+class _Schema:
+    """Row layout derived from sensor '_FIELD_MAP_'."""
+    def __init__(self, fields, precision):
+        self.fields = dict(fields)
+        self.hasTS = _TS_FIELD_ in fields
+        self.floatFlds = [fld for fld, typ in fields.items() if typ == 'float']
+        self.strFlds = [fld for fld, typ in fields.items() if typ == 'strIDX' and fld != _TS_FIELD_]
+
+        # Precision is given for all float fields, or per field (where fields
+        # that aren't listed use default precision), or 'None' for defaults.
+        if precision is None:
+            precision = {}
+        if isinstance(precision, dict):
+            self.precision = {fld: precision.get(fld, _default_precision(fld)) for fld in self.floatFlds}
+        else:
+            self.precision = {fld: precision for fld in self.floatFlds}
+
+        for fld, inVal in self.precision.items():
+            if inVal not in _PRECISION_:
+                raise ValueError(f"Invalid precision '{inVal}' for '{fld}'!")
+
+        self.desc = json.dumps({'fields': list(self.fields.items()), 'precision': self.precision},
+                               separators=(',', ':')).encode()
+        self.id = zlib.crc32(self.desc)
+        self.row = struct.Struct(
+            '<' + ('q' if self.hasTS else '') +
+            ''.join(_PRECISION_[self.precision[fld]] for fld in self.floatFlds) +
+            'H' * len(self.strFlds)
+        )
+
+    @classmethod
+    def from_desc(cls, desc):
+        data = json.loads(desc)
+        return cls(dict(data['fields']), data['precision'])
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N S
+# =========================================================
+class Encoder:
+    """
+    Streaming binary encoder for sensor records.
+
+    A stream starts with a schema frame (sent once), and each 'strIDX' value
+    (e.g. 'location') is sent once in a strings frame and then referred to by
+    a 16-bit code. Each call to 'encode()' returns a batch frame holding the
+    records as fixed-size packed rows (plus any schema/strings frames that the
+    decoder hasn't seen yet). Fields that are not in the field map are not sent,
+    and missing 'float' values are sent as NaN.
+
+    Floats are sent as 32-bit by default, except for fields with epoch seconds
+    (e.g. 'dt') which 32-bit floats can't hold exactly. 'precision' can be 'f4'
+    or 'f8' for all float fields, or a dict with precision per field, e.g.
+    {'pressure': 'f8'}, where fields that aren't listed use the default.
+    """
+    def __init__(self, fields, precision=None):
+        self._schema = _Schema(fields, precision)
+        self.reset()
+
+    @property
+    def schema_id(self):
+        return self._schema.id
+
+    def reset(self):
+        """Start new stream (i.e. resend schema and strings on next 'encode()')."""
+        self._sentSchema = False
+        self._codes = [{} for _ in self._schema.strFlds]
+
+    def _intern(self, slot, inVal, pending, new) -> int:
+        if inVal is None:
+            return _NONE_CODE_
+
+        codes = pending[slot]
+        code = self._codes[slot].get(inVal) or codes.get(inVal)
+        if code is None:
+            code = len(self._codes[slot]) + len(codes) + 1
+            if code > _MAX_CODE_:
+                raise ValueError(f"Too many distinct values for '{self._schema.strFlds[slot]}'!")
+            codes[inVal] = code
+            raw = str(inVal).encode()
+            new.append(_STRING_HDR_.pack(slot, code, len(raw)) + raw)
+
+        return code
+
+    def encode(self, data) -> bytes:
+        """
+        Encode sensor record(s) into stream frame(s).
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            Bytes to append to stream.
+        """
+        schema = self._schema
+        records = to_records(data)
+        out = []
+
+        if not self._sentSchema:
+            out.append(_frame(_FRAME_SCHEMA_, _SCHEMA_ID_.pack(schema.id) + schema.desc))
+
+        nan = math.nan
+        pack = schema.row.pack_into
+        rowSize = schema.row.size
+        strSlots = list(enumerate(schema.strFlds))
+        pending = [{} for _ in schema.strFlds]
+        newStrings = []
+
+        for start in range(0, len(records), _MAX_BATCH_):
+            chunk = records[start:start + _MAX_BATCH_]
+            buf = bytearray(_BATCH_HDR_.size + rowSize * len(chunk))
+            _BATCH_HDR_.pack_into(buf, 0, schema.id, len(chunk))
+            offset = _BATCH_HDR_.size
+
+            for rec in chunk:
+                row = [_to_usec(rec[_TS_FIELD_])] if schema.hasTS else []
+                for fld in schema.floatFlds:
+                    val = rec.get(fld)
+                    row.append(nan if val is None else val)
+                for slot, fld in strSlots:
+                    row.append(self._intern(slot, rec.get(fld), pending, newStrings))
+
+                pack(buf, offset, *row)
+                offset += rowSize
+
+            if newStrings:
+                out.append(_frame(_FRAME_STRINGS_, _SCHEMA_ID_.pack(schema.id) + b''.join(newStrings)))
+                newStrings = []
+            out.append(_frame(_FRAME_BATCH_, bytes(buf)))
+
+        # Stream state only changes once all frames are built. Otherwise a record
+        # that fails to pack would leave schema or strings unsent for good.
+        self._sentSchema = True
+        for codes, new in zip(self._codes, pending):
+            codes.update(new)
+
+        return b''.join(out)
+
+
+class Decoder:
+    """
+    Streaming decoder for frames created by 'Encoder'.
+
+    Data can be fed in chunks of any size (e.g. as read from a socket or pipe),
+    and partial frames are kept until the rest of the frame arrives. Streams
+    from several encoders (i.e. different schemas) may be interleaved.
+    """
+    def __init__(self):
+        self._buf = bytearray()
+        self._schemas = {}
+        self._strings = {}
+
+    def feed(self, chunk) -> list:
+        """
+        Decode all complete frames in buffer.
+
+        Returns:
+            List of decoded records.
+
+        Raises:
+            ValueError: If stream is corrupt or refers to unknown schema.
+        """
+        self._buf += chunk
+        records = []
+        offset = 0
+        view = memoryview(self._buf)
+
+        try:
+            while len(view) - offset >= _FRAME_HDR_.size:
+                magic, version, frameType, size = _FRAME_HDR_.unpack_from(view, offset)
+                if magic != _MAGIC_ or version != _VERSION_:
+                    raise ValueError("Invalid or unsupported sensor record stream!")
+                if len(view) - offset - _FRAME_HDR_.size < size:
+                    break
+
+                start = offset + _FRAME_HDR_.size
+                try:
+                    self._decode_frame(frameType, view[start:start + size], records)
+                except struct.error as exc:
+                    raise ValueError("Corrupt frame in sensor record stream!") from exc
+                offset = start + size
+        finally:
+            view.release()
+
+        del self._buf[:offset]
+        return records
+
+    def decode(self, data) -> list:
+        """Decode complete stream (or remainder of stream)."""
+        records = self.feed(data)
+        if self._buf:
+            raise ValueError("Incomplete frame at end of sensor record stream!")
+
+        return records
+
+    def _schema(self, schemaID) -> _Schema:
+        if schemaID not in self._schemas:
+            raise ValueError(f"Unknown schema '{schemaID}' in sensor record stream!")
+
+        return self._schemas[schemaID]
+
+    def _decode_frame(self, frameType, payload, records):
+        schemaID, = _SCHEMA_ID_.unpack_from(payload)
+
+        if frameType == _FRAME_SCHEMA_:
+            self._schemas[schemaID] = _Schema.from_desc(bytes(payload[_SCHEMA_ID_.size:]))
+            self._strings[schemaID] = [[None] for _ in self._schemas[schemaID].strFlds]
+
+        elif frameType == _FRAME_STRINGS_:
+            self._schema(schemaID)
+            strings = self._strings[schemaID]
+            offset = _SCHEMA_ID_.size
+            while offset < len(payload):
+                slot, code, size = _STRING_HDR_.unpack_from(payload, offset)
+                offset += _STRING_HDR_.size
+                if slot >= len(strings) or code == _NONE_CODE_:
+                    raise ValueError(f"Invalid string slot '{slot}' or code '{code}' in sensor record stream!")
+                vals = strings[slot]
+                vals.extend([None] * (code + 1 - len(vals)))
+                vals[code] = bytes(payload[offset:offset + size]).decode()
+                offset += size
+
+        elif frameType == _FRAME_BATCH_:
+            schemaID, count = _BATCH_HDR_.unpack_from(payload)
+            schema = self._schema(schemaID)
+            strings = self._strings[schemaID]
+
+            for row in schema.row.iter_unpack(payload[_BATCH_HDR_.size:_BATCH_HDR_.size + count * schema.row.size]):
+                rec = {}
+                idx = 0
+                if schema.hasTS:
+                    rec[_TS_FIELD_] = _from_usec(row[0])
+                    idx = 1
+                for fld in schema.floatFlds:
+                    val = row[idx]
+                    rec[fld] = None if val != val else val
+                    idx += 1
+                for slot, fld in enumerate(schema.strFlds):
+                    code = row[idx]
+                    vals = strings[slot]
+                    if code >= len(vals) or (code != _NONE_CODE_ and vals[code] is None):
+                        raise ValueError(f"Unknown string code '{code}' for '{fld}' in sensor record stream!")
+                    rec[fld] = vals[code]
+                    idx += 1
+
+                records.append(rec)
+
+        else:
+            raise ValueError(f"Unknown frame type '{frameType}' in sensor record stream!")
@@ -0,0 +1,375 @@
+import math
+from bisect import bisect_left
+from collections import deque
+
+from .sensor_base import to_records, to_epoch, from_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_TS_FIELD_: str = 'timestamp'
+_KEEP_FIELDS_ = ('location', 'locationTZ')      # Copied from last record into rollup
+
+_STATS_ = ('Count', 'Mean', 'Min', 'Max', 'Var', 'Last')
+
+_WINDOWS_ = (1, 60, 3600)                       # Default rollups: 1 sec, 1 min, 1 hour
+_EDGE_TOL_: float = 1e-12                       # Relative tolerance for snapping stamps onto window edges
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _numeric_fields(fields) -> list:
+    return [fld for fld, typ in fields.items() if typ == 'float']
+
+
+def rollup_field_map(fields) -> dict:
+    """
+    Create field map for rollup records based on sensor field map.
+
+    Each 'float' field 'xyz' turns into 'xyzCount', 'xyzMean', 'xyzMin',
+    'xyzMax', 'xyzVar', and 'xyzLast' fields.
+    """
+    flds = {_TS_FIELD_: 'strIDX'}
+    flds.update({fld: 'strIDX' for fld in _KEEP_FIELDS_ if fld in fields})
+    flds['window'] = 'float'
+    for fld in _numeric_fields(fields):
+        flds.update({f"{fld}{stat}": 'float' for stat in _STATS_})
+
+    return flds
+
+
+class _Stats:
+    """Running count/mean/min/max/variance/last for a single field."""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = None
+
+    def update(self, val):
+        if val is None or val != val:
+            return
+
+        # Welford's online algorithm
+        self.count += 1
+        delta = val - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (val - self.mean)
+        self.min = min(self.min, val)
+        self.max = max(self.max, val)
+        self.last = val
+
+    def remove(self, val):
+        if val is None or val != val:
+            return
+
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+
+        self.count -= 1
+        delta = val - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (val - self.mean)
+
+    def update_batch(self, col):
+        """Fold a whole column (list, 'array', 'memoryview', ...) into stats."""
+        total = math.fsum(col)
+        if total != total:
+            # Column has missing values ('nan'), so drop them first.
+            col = [val for val in col if val == val]
+            total = math.fsum(col)
+
+        num = len(col)
+        if num == 0:
+            return
+
+        mean = total / num
+        # Two passes, as 'sum(x*x) - n*mean*mean' cancels out for large values (e.g. epoch stamps)
+        m2 = math.fsum((val - mean) ** 2 for val in col)
+        self.merge(num, mean, m2, min(col), max(col), col[-1])
+
+    def merge(self, count, mean, m2, minVal, maxVal, last):
+        # Chan et al. parallel variance algorithm
+        num = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / num
+        self.mean += delta * count / num
+        self.count = num
+        self.min = min(self.min, minVal)
+        self.max = max(self.max, maxVal)
+        self.last = last
+
+    def as_dict(self, fld) -> dict:
+        if self.count == 0:
+            return {f"{fld}Count": 0, f"{fld}Mean": None, f"{fld}Min": None,
+                    f"{fld}Max": None, f"{fld}Var": None, f"{fld}Last": None}
+
+        return {
+            f"{fld}Count": self.count,
+            f"{fld}Mean": self.mean,
+            f"{fld}Min": self.min,
+            f"{fld}Max": self.max,
+            f"{fld}Var": self.m2 / self.count,
+            f"{fld}Last": self.last,
+        }
+
+
+def summarize(data, fields) -> dict:
+    """
+    Get count/mean/min/max/variance/last for all numeric fields over a set of records.
+
+    Returns:
+        Dict with same 'xyzCount', 'xyzMean', ... keys as rollup records.
+    """
+    stats = {fld: _Stats() for fld in _numeric_fields(fields)}
+    for rec in to_records(data):
+        for fld, fldStats in stats.items():
+            val = rec.get(fld)
+            fldStats.update(val if isinstance(val, (int, float)) else None)
+
+    out = {}
+    for fld, fldStats in stats.items():
+        out.update(fldStats.as_dict(fld))
+
+    return out
+
+
+# =========================================================
+#              W I N D O W   D E F I N I T I O N S
+# =========================================================
+class Tumbling:
+    """
+    Fixed, non-overlapping window of 'width' seconds for all numeric fields.
+
+    A rollup record is emitted for a window when the first record for a later
+    window arrives, or when 'flush()' is called.
+    """
+    def __init__(self, fields, width):
+        self._flds = _numeric_fields(fields)
+        self._width = float(width)
+        self._idx = None
+        self._start = None
+        self._stats = {}
+        self._keep = {}
+
+    @property
+    def width(self):
+        return self._width
+
+    def _window(self, ts) -> int:
+        # Window index rather than start time, as float rounding can push a
+        # stamp on a window edge into the previous window (e.g. 0.6 / 0.1
+        # is 5.999...). Such stamps are snapped onto the edge.
+        pos = ts / self._width
+        edge = round(pos)
+        return edge if math.isclose(pos, edge, rel_tol=_EDGE_TOL_) else math.floor(pos)
+
+    def _open(self, idx):
+        self._idx = idx
+        self._start = idx * self._width
+        self._stats = {fld: _Stats() for fld in self._flds}
+
+    def flush(self) -> list:
+        """Emit rollup for current window (if any) and close it."""
+        if self._start is None:
+            return []
+
+        rollup = {_TS_FIELD_: from_epoch(self._start), **self._keep, 'window': self._width}
+        for fld, stats in self._stats.items():
+            rollup.update(stats.as_dict(fld))
+
+        self._idx = self._start = None
+        return [rollup]
+
+    def update(self, record) -> list:
+        idx = self._window(to_epoch(record[_TS_FIELD_]))
+        out = []
+        if idx != self._idx:
+            out = self.flush()
+            self._open(idx)
+
+        for fld in self._flds:
+            self._stats[fld].update(record.get(fld))
+        self._keep = {fld: record[fld] for fld in _KEEP_FIELDS_ if fld in record}
+
+        return out
+
+    def update_batch(self, columns) -> list:
+        """
+        Update window with columnar batch (e.g. from 'Store.scan()').
+
+        Batch must have an epoch 'timestamp' column in ascending order and a
+        column per numeric field. Each column is sliced per window and folded
+        in as a whole.
+        """
+        stamps = columns[_TS_FIELD_]
+        out = []
+        lo = 0
+        while lo < len(stamps):
+            idx = self._window(stamps[lo])
+
+            # Split point from bisect is only a guess near window edges, so
+            # move it until it agrees with '_window()'. This also ensures
+            # that each pass takes at least one stamp.
+            hi = max(bisect_left(stamps, (idx + 1) * self._width, lo), lo + 1)
+            while hi - 1 > lo and self._window(stamps[hi - 1]) != idx:
+                hi -= 1
+            while hi < len(stamps) and self._window(stamps[hi]) == idx:
+                hi += 1
+
+            if idx != self._idx:
+                out += self.flush()
+                self._open(idx)
+
+            for fld in self._flds:
+                if fld in columns:
+                    self._stats[fld].update_batch(columns[fld][lo:hi])
+            lo = hi
+
+        return out
+
+
+class Sliding:
+    """
+    Overlapping window covering the last 'width' seconds for all numeric fields.
+
+    Count, mean, and variance are updated in O(1) as records enter and leave
+    the window, and min/max use monotonic queues (amortized O(1)). If 'hop'
+    is set, a rollup record is emitted every 'hop' seconds.
+    """
+    def __init__(self, fields, width, hop=None):
+        self._flds = _numeric_fields(fields)
+        self._width = float(width)
+        self._hop = hop
+        self._next = None
+        self._buf = deque()
+        self._stats = {fld: _Stats() for fld in self._flds}
+        self._minQ = {fld: deque() for fld in self._flds}
+        self._maxQ = {fld: deque() for fld in self._flds}
+        self._keep = {}
+        self._now = None
+
+    @property
+    def width(self):
+        return self._width
+
+    def update(self, record) -> list:
+        ts = to_epoch(record[_TS_FIELD_])
+        out = []
+        if self._hop is not None:
+            if self._next is None:
+                self._next = math.floor(ts / self._hop) * self._hop + self._hop
+            # Each hop sees the window as of the hop time. Once a gap has
+            # emptied the window, skip ahead (rather than emit a flood of
+            # empty rollups) to the first hop after this record.
+            while ts >= self._next and self._now is not None:
+                self._evict(self._next - self._width)
+                if not self._buf:
+                    self._next = math.floor(ts / self._hop) * self._hop + self._hop
+                    break
+                out.append(self.rollup(self._next))
+                self._next += self._hop
+
+        vals = tuple(record.get(fld) for fld in self._flds)
+        self._buf.append((ts, vals))
+
+        for fld, val in zip(self._flds, vals):
+            if val is None or val != val:
+                continue
+            self._stats[fld].update(val)
+            minQ, maxQ = self._minQ[fld], self._maxQ[fld]
+            while minQ and minQ[-1][1] >= val:
+                minQ.pop()
+            minQ.append((ts, val))
+            while maxQ and maxQ[-1][1] <= val:
+                maxQ.pop()
+            maxQ.append((ts, val))
+
+        self._now = ts
+        self._keep = {fld: record[fld] for fld in _KEEP_FIELDS_ if fld in record}
+        self._evict(ts - self._width)
+
+        return out
+
+    def _evict(self, cutoff):
+        while self._buf and self._buf[0][0] <= cutoff:
+            _, vals = self._buf.popleft()
+            for fld, val in zip(self._flds, vals):
+                self._stats[fld].remove(val)
+
+        for fld in self._flds:
+            for queue in (self._minQ[fld], self._maxQ[fld]):
+                while queue and queue[0][0] <= cutoff:
+                    queue.popleft()
+
+    def rollup(self, ts=None) -> dict:
+        """Get rollup record for the window ending at 'ts' (default is latest record)."""
+        rollup = {_TS_FIELD_: from_epoch(self._now if ts is None else ts), **self._keep, 'window': self._width}
+        for fld, stats in self._stats.items():
+            data = stats.as_dict(fld)
+            if stats.count:
+                data[f"{fld}Min"] = self._minQ[fld][0][1]
+                data[f"{fld}Max"] = self._maxQ[fld][0][1]
+            rollup.update(data)
+
+        return rollup
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class Aggregator:
+    """
+    Streaming aggregation stage with tumbling windows of several widths.
+
+    Feed it records from any sensor (or columnar batches from the time-series
+    store), and it returns compact rollup records (see 'rollup_field_map()')
+    as windows close.
+    """
+    def __init__(self, fields, windows=_WINDOWS_):
+        self._flds = fields
+        self._windows = [Tumbling(fields, width) for width in windows]
+
+    @property
+    def fields(self):
+        return rollup_field_map(self._flds)
+
+    def process(self, data) -> list:
+        """
+        Update windows with sensor record(s).
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            List of rollup records for any windows that closed.
+        """
+        out = []
+        for rec in to_records(data):
+            for window in self._windows:
+                out += window.update(rec)
+
+        return out
+
+    def process_batch(self, columns) -> list:
+        """Update windows with columnar batch (see 'Tumbling.update_batch()')."""
+        out = []
+        for window in self._windows:
+            out += window.update_batch(columns)
+
+        return out
+
+    def flush(self) -> list:
+        """Emit rollup records for all open windows."""
+        out = []
+        for window in self._windows:
+            out += window.flush()
+
+        return out
+
@@ -0,0 +1,169 @@
+import math
+from collections import deque
+
+from .sensor_base import to_records, to_epoch, from_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_TS_FIELD_: str = 'timestamp'
+_SEP_:      str = '.'           # Column names are '<sensor type>.<field>'
+_AGE_:      str = 'age'         # Seconds between frame time and source record
+
+_BUFFER_: int = 1024            # Max records kept per source (and max pending frames)
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+class _Source:
+    def __init__(self, name, fields, staleness, buffer):
+        self.name = name
+        self.fields = [fld for fld in fields if fld != _TS_FIELD_]
+        self.types = fields
+        self.staleness = staleness
+        self.buf = deque(maxlen=buffer)
+
+    def push(self, ts, record) -> bool:
+        # Records from a single source must arrive in time order.
+        if self.buf and ts < self.buf[-1][0]:
+            return False
+
+        self.buf.append((ts, record))
+        return True
+
+    def as_of(self, ts):
+        """Get latest record at or before 'ts' (and not older than 'staleness')."""
+        for recTS, rec in reversed(self.buf):
+            if recTS <= ts:
+                if self.staleness is not None and ts - recTS > self.staleness:
+                    return None, None
+                return recTS, rec
+
+        return None, None
+
+    def columns(self, ts) -> dict:
+        recTS, rec = self.as_of(ts)
+        prefix = self.name + _SEP_
+        if rec is None:
+            cols = {prefix + fld: None for fld in self.fields}
+            cols[prefix + _AGE_] = None
+        else:
+            cols = {prefix + fld: rec.get(fld) for fld in self.fields}
+            cols[prefix + _AGE_] = ts - recTS
+
+        return cols
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class AsOfJoin:
+    """
+    Streaming as-of join of sensor streams with different rates.
+
+    Frames are emitted on a common clock, which is either the records of one
+    source (e.g. 'sensehat') or a fixed period in seconds. Each frame holds
+    the last known record of every source at the frame time, with columns
+    named '<sensor type>.<field>' (plus '<sensor type>.age'). A source whose
+    last record is older than its 'staleness' limit shows up as 'None'.
+
+    Frames are held back until all data up to 'lag' seconds before the newest
+    record seen has (presumably) arrived, so sources that deliver late can
+    still be joined. Memory use is bounded by 'buffer' records per source.
+    """
+    def __init__(self, clock, lag=0.0, buffer=_BUFFER_):
+        self._clock = clock
+        self._period = None if isinstance(clock, str) else float(clock)
+        self._lag = lag
+        self._buffer = buffer
+        self._sources = {}
+        self._pending = deque()
+        self._next = None
+        self._watermark = -math.inf
+
+    def add_source(self, name, fields, staleness=None):
+        """
+        Add stream to join.
+
+        Args:
+            name: Source name (i.e. sensor type), used as column name prefix.
+            fields: Sensor field map ('_FIELD_MAP_').
+            staleness: Max age (seconds) of last known value, or 'None' for no limit.
+        """
+        self._sources[name] = _Source(name, fields, staleness, self._buffer)
+        return self
+
+    def add_sensor(self, sensor, staleness=None):
+        return self.add_source(sensor.type, sensor.fields, staleness)
+
+    @property
+    def fields(self) -> dict:
+        """Field map for joined frames."""
+        flds = {_TS_FIELD_: 'strIDX'}
+        for src in self._sources.values():
+            flds.update({src.name + _SEP_ + fld: src.types[fld] for fld in src.fields})
+            flds[src.name + _SEP_ + _AGE_] = 'float'
+
+        return flds
+
+    def _frame(self, ts) -> dict:
+        frame = {_TS_FIELD_: from_epoch(ts)}
+        for src in self._sources.values():
+            frame.update(src.columns(ts))
+
+        return frame
+
+    def _emit(self, force=False) -> list:
+        cutoff = self._watermark - (0.0 if force else self._lag)
+        out = []
+
+        if self._period is None:
+            while self._pending and (force or self._pending[0] <= cutoff or len(self._pending) > self._buffer):
+                out.append(self._frame(self._pending.popleft()))
+            return out
+
+        if self._next is None:
+            return out
+
+        # Skip ahead (rather than emit a flood of empty frames) after a long gap.
+        if (cutoff - self._next) / self._period > self._buffer:
+            self._next = math.floor(cutoff / self._period - self._buffer) * self._period
+
+        while self._next <= cutoff:
+            out.append(self._frame(self._next))
+            self._next += self._period
+
+        return out
+
+    def push(self, name, data) -> list:
+        """
+        Add record(s) from a source.
+
+        Args:
+            name: Source name (i.e. sensor type).
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            List of joined frames that are ready.
+
+        Raises:
+            KeyError: If source is unknown.
+        """
+        src = self._sources[name]
+        for rec in to_records(data):
+            ts = to_epoch(rec[_TS_FIELD_])
+            if not src.push(ts, rec):
+                continue
+
+            self._watermark = max(self._watermark, ts)
+            if self._period is None and name == self._clock:
+                self._pending.append(ts)
+            elif self._period is not None and self._next is None:
+                self._next = math.ceil(ts / self._period) * self._period
+
+        return self._emit()
+
+    def flush(self) -> list:
+        """Emit all pending frames without waiting for 'lag'."""
+        return self._emit(force=True)
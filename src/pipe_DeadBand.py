@@ -0,0 +1,147 @@
+from .sensor_base import to_records, to_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_TS_FIELD_: str = 'timestamp'
+
+_MODE_RECORD_: str = 'record'   # Emit full record if any field changed enough
+_MODE_FIELD_:  str = 'field'    # Emit only fields that changed enough
+
+_HEARTBEAT_: int = 600          # Max seconds between emitted values
+
+# Default dead-bands for slow moving environmental fields. Only fields with
+# a dead-band decide whether a record is emitted. Other fields (e.g. noisy
+# IMU values, or OpenWeather 'dt'/'sunrise'/'sunset') are carried along in
+# emitted records, but don't cause emits on their own.
+_THRESHOLDS_ = {
+    'tempDefault':  {'abs': 0.1},   # SenseHat
+    'tempHumidity': {'abs': 0.1},
+    'humidity':     {'abs': 0.5},
+    'pressure':     {'abs': 0.1},
+    'temp':         {'abs': 0.1},   # OpenWeather
+    'feels_like':   {'abs': 0.1},
+    'dew_point':    {'abs': 0.1},
+}
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _parse_threshold(inVal) -> tuple:
+    if inVal is None:
+        return 0.0, None
+    if isinstance(inVal, (int, float)):
+        return float(inVal), None
+
+    return inVal.get('abs'), inVal.get('rel')
+
+
+def _changed(val, ref, absBand, relBand) -> bool:
+    if val is None or ref is None:
+        return val is not ref
+
+    delta = abs(val - ref)
+    if absBand is not None and delta > absBand:
+        return True
+    if relBand is not None and delta > relBand * abs(ref):
+        return True
+
+    return False
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class DeadBand:
+    """
+    Filter stage that drops records (or fields) that have not changed enough.
+
+    Each 'float' field has an absolute ('abs') and/or relative ('rel') dead-band,
+    and a value only counts as changed once it moves outside the band around
+    the last emitted value. A value is also emitted if nothing has been emitted
+    for 'heartbeat' seconds, so consumers can tell a quiet sensor from a dead one.
+
+    Thresholds are given per field as a number (i.e. absolute band) or as a dict:
+
+        {'pressure': 0.1, 'humidity': {'rel': 0.01}, 'tempDefault': {'abs': 0.2, 'rel': 0.005}}
+
+    Only fields that have a threshold are checked. Other fields are kept as is
+    in emitted records (use a threshold of 0 to emit on every change).
+    """
+    def __init__(self, fields, thresholds=None, heartbeat=_HEARTBEAT_, mode=_MODE_RECORD_):
+        if mode not in (_MODE_RECORD_, _MODE_FIELD_):
+            raise ValueError(f"Invalid dead-band mode '{mode}'!")
+
+        thresholds = _THRESHOLDS_ if thresholds is None else thresholds
+
+        self._flds = fields
+        self._mode = mode
+        self._heartbeat = heartbeat
+        self._bands = {
+            fld: _parse_threshold(thresholds[fld])
+            for fld, typ in fields.items() if typ == 'float' and fld in thresholds
+        }
+        self._keys = [fld for fld in fields if fld not in self._bands]
+        self._last = {}         # Field -> (last emitted value, timestamp)
+        self._numIn = 0
+        self._numOut = 0
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def ratio(self):
+        """Ratio of emitted vs received records."""
+        return self._numOut / self._numIn if self._numIn else 1.0
+
+    def _is_due(self, fld, ts) -> bool:
+        if fld not in self._last:
+            return True
+
+        return self._heartbeat is not None and ts - self._last[fld][1] >= self._heartbeat
+
+    def _changed_fields(self, record, ts) -> list:
+        return [
+            fld for fld, (absBand, relBand) in self._bands.items()
+            if self._is_due(fld, ts) or _changed(record.get(fld), self._last[fld][0], absBand, relBand)
+        ]
+
+    def reset(self):
+        self._last = {}
+
+    def process(self, data) -> list:
+        """
+        Filter sensor record(s).
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            List of records to keep. In 'field' mode, these only hold the
+            fields without dead-band (e.g. 'timestamp', 'location') and the
+            fields that changed.
+        """
+        out = []
+        for rec in to_records(data):
+            self._numIn += 1
+            ts = to_epoch(rec[_TS_FIELD_])
+            changed = self._changed_fields(rec, ts)
+            if not changed:
+                continue
+
+            if self._mode == _MODE_RECORD_:
+                changed = list(self._bands)
+                out.append(rec)
+            else:
+                out.append({
+                    **{fld: rec[fld] for fld in self._keys if fld in rec},
+                    **{fld: rec.get(fld) for fld in changed},
+                })
+
+            for fld in changed:
+                self._last[fld] = (rec.get(fld), ts)
+            self._numOut += 1
+
+        return out
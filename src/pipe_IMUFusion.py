@@ -0,0 +1,233 @@
+import math
+
+import numpy as np
+
+from .sensor_base import to_records, to_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_TS_FIELD_: str = 'timestamp'
+
+_ACCEL_FIELDS_   = ('accelX', 'accelY', 'accelZ')         # g
+_GYRO_FIELDS_    = ('gyroX', 'gyroY', 'gyroZ')            # rad/s
+_COMPASS_FIELDS_ = ('compassX', 'compassY', 'compassZ')   # uT
+_ORIENT_FIELDS_  = ('orientPitch', 'orientRoll', 'orientYaw')
+
+_ALPHA_:   float = 0.98     # Weight of gyro (vs. accelerometer/compass) in complementary filter
+_MAX_GAP_: float = 1.0      # Restart filter from accelerometer/compass after gap (seconds) longer than this
+
+_MIN_COS_:  float = 1e-3    # Keep Euler rates finite near +/-90 deg pitch (gimbal lock)
+_MAX_GAIN_: float = 1e6     # Max 'alpha ** -n' within one filter chunk (see '_iir()')
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _column(columns, fld):
+    col = columns[fld]
+    if isinstance(col, np.ndarray) and col.dtype == np.float64:
+        return col
+
+    # Lists from records may hold 'None' for missing values.
+    if isinstance(col, (list, tuple)):
+        col = [np.nan if val is None else val for val in col]
+
+    return np.asarray(col, dtype=np.float64)
+
+
+def _timestamps(col):
+    if isinstance(col, (list, tuple)):
+        return np.array([to_epoch(ts) for ts in col], dtype=np.float64)
+
+    return np.asarray(col, dtype=np.float64)
+
+
+def tilt(accel, compass=None) -> tuple:
+    """
+    Get pitch, roll, and yaw (radians) from accelerometer and compass alone.
+
+    Uses the usual aerospace convention: roll around X, pitch around Y, and
+    tilt-compensated heading from the compass. Yaw is 'NaN' without compass.
+
+    Args:
+        accel: Tuple with arrays of X, Y, and Z acceleration.
+        compass: Tuple with arrays of X, Y, and Z magnetic field (or 'None').
+
+    Returns:
+        Tuple with arrays of pitch, roll, and yaw.
+    """
+    ax, ay, az = accel
+    roll = np.arctan2(ay, az)
+    pitch = np.arctan2(-ax, np.hypot(ay, az))
+
+    if compass is None:
+        return pitch, roll, np.full_like(roll, np.nan)
+
+    mx, my, mz = compass
+    sinR, cosR = np.sin(roll), np.cos(roll)
+    sinP, cosP = np.sin(pitch), np.cos(pitch)
+    xh = mx * cosP + (my * sinR + mz * cosR) * sinP
+    yh = my * cosR - mz * sinR
+
+    return pitch, roll, np.arctan2(-yh, xh)
+
+
+def euler_rates(gyro, pitch, roll) -> tuple:
+    """Convert body rates (gyro X, Y, Z) to pitch, roll, and yaw rates at given attitude."""
+    gx, gy, gz = gyro
+    sinR, cosR = np.sin(roll), np.cos(roll)
+    cosP = np.cos(pitch)
+    cosP = np.where(np.abs(cosP) < _MIN_COS_, _MIN_COS_, cosP)
+    tanP = np.sin(pitch) / cosP
+
+    return (
+        gy * cosR - gz * sinR,
+        gx + (gy * sinR + gz * cosR) * tanP,
+        (gy * sinR + gz * cosR) / cosP,
+    )
+
+
+def _iir(u, alpha, x0):
+    """
+    Run 'x[k] = alpha * x[k-1] + u[k]' over whole array without a Python loop per sample.
+
+    The closed form 'x[k] = alpha**k * (x0 + sum(u[j] * alpha**-j))' is
+    evaluated with 'cumsum()', in chunks short enough that 'alpha**-j'
+    doesn't grow past '_MAX_GAIN_' and swamp the precision of the sum.
+    """
+    if alpha <= 0:
+        return np.array(u, dtype=np.float64)
+
+    size = len(u) if alpha >= 1 else max(int(math.log(_MAX_GAIN_) / -math.log(alpha)), 1)
+    out = np.empty(len(u), dtype=np.float64)
+
+    for start in range(0, len(u), size):
+        chunk = u[start:start + size]
+        powers = alpha ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = powers * (x0 + np.cumsum(chunk / powers))
+        x0 = out[start + len(chunk) - 1]
+
+    return out
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class Complementary:
+    """
+    Offline orientation (pitch/roll/yaw) from raw SenseHat IMU data.
+
+    Complementary filter that blends integrated gyro rates (weight 'alpha')
+    with the absolute but noisy attitude from accelerometer and compass
+    (weight '1 - alpha'). The filter is linear once gyro rates are mapped to
+    Euler rates (which is done at the measured attitude), so whole columns
+    are filtered with NumPy instead of one sample at a time. This lets the
+    sampling loop log raw values only (see 'orientation' setting in
+    'sensor_SenseHat') and historical data be reprocessed in bulk.
+
+    Filter state carries over between batches, so a long history can be fed
+    in chunks (e.g. from 'Store.scan()'). Output is in degrees within
+    [0, 360), same as 'SenseHat.get_orientation()'. Note that results follow
+    the aerospace axis convention and may differ from on-device fusion.
+    """
+    def __init__(self, alpha=_ALPHA_, maxGap=_MAX_GAP_):
+        self._alpha = alpha
+        self._maxGap = maxGap
+        self._state = None      # (timestamp, unwrapped pitch/roll/yaw) of last sample
+
+    def reset(self):
+        self._state = None
+
+    def _filter(self, ts, meas, rates, alphas) -> list:
+        """Filter one unbroken run of samples, continuing from filter state (if any)."""
+        out = []
+        for idx, (angle, rate, alpha) in enumerate(zip(meas, rates, alphas)):
+            if self._state is None:
+                prevTS, x0, start = ts[0], angle[0], 1
+            else:
+                prevTS, x0, start = self._state[0], self._state[1][idx], 0
+
+            # Unwrap measured angles relative to filter state, so that blending
+            # doesn't cut across the 0/360 deg seam.
+            angle = np.unwrap(np.concatenate(([x0], angle)))[1:]
+            u = alpha * rate * np.diff(ts, prepend=prevTS) + (1 - alpha) * angle
+
+            filt = np.empty(len(ts), dtype=np.float64)
+            filt[:start] = x0
+            filt[start:] = _iir(u[start:], alpha, x0)
+            out.append(filt)
+
+        self._state = (ts[-1], [filt[-1] for filt in out])
+        return out
+
+    def process_batch(self, columns) -> dict:
+        """
+        Compute orientation for columnar batch of raw IMU data.
+
+        Args:
+            columns: Dict with 'timestamp' (epoch or ISO strings), 'accelX/Y/Z'
+                     (g), 'gyroX/Y/Z' (rad/s), and optionally 'compassX/Y/Z' (uT)
+                     columns, e.g. from 'Store.scan()' or NumPy arrays.
+
+        Returns:
+            Dict with 'orientPitch', 'orientRoll', and 'orientYaw' arrays (degrees).
+            Rows with missing IMU values get 'NaN'. Without compass, yaw is
+            integrated gyro only (starting at 0).
+        """
+        ts = _timestamps(columns[_TS_FIELD_])
+        accel = [_column(columns, fld) for fld in _ACCEL_FIELDS_]
+        gyro = [_column(columns, fld) for fld in _GYRO_FIELDS_]
+        hasCompass = all(fld in columns for fld in _COMPASS_FIELDS_)
+        compass = [_column(columns, fld) for fld in _COMPASS_FIELDS_] if hasCompass else []
+
+        out = np.full((3, len(ts)), np.nan)
+        valid = ~np.isnan(ts)
+        for col in accel + gyro + compass:
+            valid &= ~np.isnan(col)
+
+        rows = np.flatnonzero(valid)
+        if len(rows) == 0:
+            return dict(zip(_ORIENT_FIELDS_, out))
+
+        ts = ts[rows]
+        meas = list(tilt([col[rows] for col in accel], [col[rows] for col in compass] if hasCompass else None))
+        rates = euler_rates([col[rows] for col in gyro], meas[0], meas[1])
+        alphas = [self._alpha] * 3
+        if not hasCompass:
+            meas[2] = np.zeros(len(rows))
+            alphas[2] = 1.0
+
+        # Filter restarts after gaps (longer than 'maxGap') and timestamps that go backwards.
+        dt = np.diff(ts, prepend=self._state[0] if self._state is not None else np.nan)
+        breaks = np.flatnonzero(~((dt > 0) & (dt <= self._maxGap)))
+        bounds = sorted(set(breaks) | {0, len(rows)})
+
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if lo in breaks:
+                self._state = None
+            filt = self._filter(ts[lo:hi], [m[lo:hi] for m in meas], [r[lo:hi] for r in rates], alphas)
+            out[:, rows[lo:hi]] = filt
+
+        return dict(zip(_ORIENT_FIELDS_, np.degrees(out) % 360.0))
+
+    def process(self, data) -> list:
+        """
+        Fill in orientation for sensor record(s) (i.e. output from 'get_data()').
+
+        Returns:
+            List of new records with 'orientPitch', 'orientRoll', and 'orientYaw'.
+        """
+        records = to_records(data)
+        if not records:
+            return []
+
+        flds = (_TS_FIELD_,) + _ACCEL_FIELDS_ + _GYRO_FIELDS_ + _COMPASS_FIELDS_
+        columns = {fld: [rec.get(fld) for rec in records] for fld in flds}
+        orient = self.process_batch(columns)
+
+        return [
+            {**rec, **{fld: None if np.isnan(orient[fld][idx]) else float(orient[fld][idx])
+                       for fld in _ORIENT_FIELDS_}}
+            for idx, rec in enumerate(records)
+        ]
@@ -0,0 +1,284 @@
+import ast
+from collections import deque
+
+from .sensor_base import to_records, to_epoch
+from .pipe_Aggregate import Sliding
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_TS_FIELD_: str = 'timestamp'
+_KEEP_FIELDS_ = ('timestamp', 'location', 'locationTZ')     # Copied from record into alert
+
+_STATE_TRIGGERED_: str = 'triggered'
+_STATE_CLEARED_:   str = 'cleared'
+
+# Functions available in rule expressions, and the stat they map to
+_WINDOW_FUNCS_ = {'mean': 'Mean', 'min': 'Min', 'max': 'Max', 'var': 'Var', 'count': 'Count'}
+_CHANGE_FUNCS_ = ('rate', 'delta')
+_BUILTINS_ = {'abs': abs}
+
+_ALLOWED_NODES_ = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Lt, ast.LtE, ast.Gt,
+    ast.GtE, ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant, ast.Call,
+)
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+class _Change:
+    """Change ('delta') or change/sec ('rate') of a field over last 'width' seconds (or since last record)."""
+    def __init__(self, fld, width, perSec):
+        self.fld = fld
+        self.width = width
+        self.perSec = perSec
+        self.buf = deque()
+        self.value = None
+
+    def update(self, ts, record):
+        val = record.get(self.fld)
+        if not isinstance(val, (int, float)):
+            self.value = None
+            return
+
+        self.buf.append((ts, val))
+        if self.width is None:
+            while len(self.buf) > 2:
+                self.buf.popleft()
+        else:
+            while len(self.buf) > 2 and ts - self.buf[1][0] >= self.width:
+                self.buf.popleft()
+
+        oldTS, oldVal = self.buf[0]
+        if len(self.buf) < 2 or ts <= oldTS:
+            self.value = None
+        else:
+            self.value = (val - oldVal) / (ts - oldTS) if self.perSec else val - oldVal
+
+
+class _Window:
+    """Stat of a field over sliding window of 'width' seconds."""
+    def __init__(self, fld, width):
+        self.fld = fld
+        self.window = Sliding({_TS_FIELD_: 'strIDX', fld: 'float'}, width)
+        self.rollup = {}
+
+    def update(self, ts, record):
+        val = record.get(self.fld)
+        self.window.update({_TS_FIELD_: ts, self.fld: val if isinstance(val, (int, float)) else None})
+        self.rollup = self.window.rollup()
+
+    def value(self, stat):
+        return self.rollup.get(self.fld + stat)
+
+
+class _Compiler(ast.NodeTransformer):
+    """
+    Rewrite rule expression so that field names read from current record and
+    function calls read from shared accessors (see 'RuleEngine._accessor()').
+    """
+    def __init__(self, fields, accessor):
+        self._flds = fields
+        self._accessor = accessor
+
+    def generic_visit(self, node):
+        if not isinstance(node, _ALLOWED_NODES_):
+            raise ValueError(f"Unsupported syntax '{type(node).__name__}' in rule expression!")
+        return super().generic_visit(node)
+
+    def _field(self, node) -> str:
+        if not isinstance(node, ast.Name) or node.id not in self._flds:
+            raise ValueError(f"Unknown field '{ast.unparse(node)}' in rule expression!")
+        return node.id
+
+    @staticmethod
+    def _width(node):
+        if not isinstance(node, ast.Constant) or not isinstance(node.value, (int, float)):
+            raise ValueError("Window width in rule expression must be a number (seconds)!")
+        return node.value
+
+    def visit_Constant(self, node):
+        # Numbers only, as e.g. string or bytes constants could be multiplied into huge values
+        if not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant '{ast.unparse(node)}' in rule expression!")
+        return node
+
+    def visit_Name(self, node):
+        fld = self._field(node)
+        return ast.copy_location(
+            ast.Call(ast.Attribute(ast.Name('_rec', ast.Load()), 'get', ast.Load()),
+                     [ast.Constant(fld)], []),
+            node
+        )
+
+    def visit_Call(self, node):
+        func = node.func.id if isinstance(node.func, ast.Name) else None
+        if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            raise ValueError(f"Unsupported function call '{ast.unparse(node)}' in rule expression!")
+
+        if func in _BUILTINS_:
+            # Check arguments like any other part of the expression ('func' name is left as is).
+            node.args = [self.visit(arg) for arg in node.args]
+            return node
+
+        if func in _CHANGE_FUNCS_ and len(node.args) in (1, 2):
+            width = self._width(node.args[1]) if len(node.args) == 2 else None
+            key = (func, self._field(node.args[0]), width)
+        elif func in _WINDOW_FUNCS_ and len(node.args) == 2:
+            key = (func, self._field(node.args[0]), self._width(node.args[1]))
+        else:
+            raise ValueError(f"Unsupported function call '{ast.unparse(node)}' in rule expression!")
+
+        return ast.copy_location(ast.Name(self._accessor(key), ast.Load()), node)
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N S
+# =========================================================
+class Rule:
+    """
+    Alert rule.
+
+    Expressions are Python-like and can use record fields, numbers, arithmetic,
+    comparisons, 'and'/'or'/'not', 'abs()', and these functions:
+
+        rate(fld), rate(fld, secs)   -- change/sec since last record (or over last 'secs')
+        delta(fld), delta(fld, secs) -- change since last record (or over last 'secs')
+        mean|min|max|var|count(fld, secs) -- stat over last 'secs'
+
+    For example: "rate(pressure, 3600) < -0.5 / 3600" or "humidity > 80".
+
+    Args:
+        name: Rule name (included in alerts).
+        expr: Condition that triggers rule.
+        clear: Condition that clears rule once triggered. Default is 'not expr'.
+               A separate 'clear' condition (e.g. "humidity < 75") adds hysteresis.
+        debounce: Number of records in a row for which 'expr' must hold
+                  before rule triggers.
+    """
+    def __init__(self, name, expr, clear=None, debounce=1):
+        self.name = name
+        self.expr = expr
+        self.clear = clear
+        self.debounce = max(int(debounce), 1)
+
+
+class RuleEngine:
+    """
+    Evaluate alert rules against a stream of sensor records.
+
+    Rules are compiled once, and any rate/window functions they use are kept
+    as shared incremental accessors, so the cost per record depends only on
+    the number of rules (and not on how much history the windows cover).
+    Each time a rule triggers or clears, an alert dict is sent to every
+    notifier (i.e. any callable that accepts an alert).
+    """
+    def __init__(self, fields, rules=None, notifiers=None):
+        self._flds = fields
+        self._accessors = {}    # (func, field, width) -> (variable name, getter)
+        self._windows = {}      # (field, width) -> '_Window'
+        self._updaters = []     # Unique '_Change'/'_Window' objects to update per record
+        self._rules = []
+        self._notifiers = list(notifiers or [])
+
+        for rule in rules or []:
+            self.add_rule(rule)
+
+    @property
+    def rules(self):
+        return [rule for rule, *_ in self._rules]
+
+    def _accessor(self, key) -> str:
+        func, fld, width = key
+        if key not in self._accessors:
+            if func in _CHANGE_FUNCS_:
+                acc = _Change(fld, width, perSec=func == 'rate')
+                self._updaters.append(acc)
+                getter = lambda acc=acc: acc.value
+            else:
+                # Window stats for same field and width share one sliding window
+                if (fld, width) not in self._windows:
+                    self._windows[(fld, width)] = _Window(fld, width)
+                    self._updaters.append(self._windows[(fld, width)])
+                acc = self._windows[(fld, width)]
+                getter = lambda acc=acc, stat=_WINDOW_FUNCS_[func]: acc.value(stat)
+
+            self._accessors[key] = (f"_a{len(self._accessors)}", getter)
+
+        return self._accessors[key][0]
+
+    def _compile(self, expr):
+        tree = _Compiler(self._flds, self._accessor).visit(ast.parse(expr, mode='eval'))
+        return compile(ast.fix_missing_locations(tree), f"<rule: {expr}>", 'eval')
+
+    def add_rule(self, rule):
+        """Add rule (a 'Rule' or a dict with 'Rule' arguments)."""
+        rule = rule if isinstance(rule, Rule) else Rule(**rule)
+        cond = self._compile(rule.expr)
+        clear = self._compile(rule.clear) if rule.clear else None
+
+        # (rule, compiled condition, compiled clear condition, [hits in a row, is active])
+        self._rules.append((rule, cond, clear, [0, False]))
+
+    def add_notifier(self, notifier):
+        self._notifiers.append(notifier)
+
+    def _env(self, ts, record) -> dict:
+        for acc in self._updaters:
+            acc.update(ts, record)
+
+        env = {'__builtins__': _BUILTINS_, '_rec': record}
+        env.update((name, getter()) for name, getter in self._accessors.values())
+
+        return env
+
+    @staticmethod
+    def _eval(code, env) -> bool:
+        # Missing values (i.e. 'None') make the condition false
+        try:
+            return bool(eval(code, env))
+        except (TypeError, ZeroDivisionError):
+            return False
+
+    def process(self, data) -> list:
+        """
+        Evaluate all rules against sensor record(s).
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            List of alerts (which have also been sent to notifiers).
+        """
+        alerts = []
+        for rec in to_records(data):
+            env = self._env(to_epoch(rec[_TS_FIELD_]), rec)
+
+            for rule, cond, clear, state in self._rules:
+                hit = self._eval(cond, env)
+                state[0] = state[0] + 1 if hit else 0
+
+                if not state[1] and state[0] >= rule.debounce:
+                    state[1] = True
+                    alerts.append(self._alert(rule, _STATE_TRIGGERED_, rec))
+                elif state[1] and (self._eval(clear, env) if clear is not None else not hit):
+                    state[1] = False
+                    alerts.append(self._alert(rule, _STATE_CLEARED_, rec))
+
+        for alert in alerts:
+            for notifier in self._notifiers:
+                notifier(alert)
+
+        return alerts
+
+    @staticmethod
+    def _alert(rule, state, record) -> dict:
+        return {
+            'rule': rule.name,
+            'state': state,
+            'expr': rule.expr,
+            **{fld: record.get(fld) for fld in _KEEP_FIELDS_},
+            'record': record,
+        }
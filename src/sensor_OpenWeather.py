@@ -5,30 +5,29 @@ from datetime import datetime
 from copy import deepcopy
 
 from .sensor_base import _SensorBase
+from .units import format_units
 
 # =========================================================
 #                      G L O B A L S
 # =========================================================
 _FIELD_MAP_ = {
-    'timestamp':    'strIDX',
-    'location':     'strIDX',
-    'locationTZ':   'strIDX',
-    'tempDefault':  'float',
-    'tempHumidity': 'float',
-    'humidity':     'float',
-    'pressure':     'float',
-    'orientPitch':  'float',
-    'orientRoll':   'float',
-    'orientYaw':    'float',
-    'compassX':     'float',
-    'compassY':     'float',
-    'compassZ':     'float',
-    'accelX':       'float',
-    'accelY':       'float',
-    'accelZ':       'float',
-    'gyroX':        'float',
-    'gyroY':        'float',
-    'gyroZ':        'float',
+    'timestamp':  'strIDX',
+    'location':   'strIDX',
+    'locationTZ': 'strIDX',
+    'clouds':     'float',
+    'dew_point':  'float',
+    'dt':         'float',
+    'feels_like': 'float',
+    'humidity':   'float',
+    'pressure':   'float',
+    'sunrise':    'float',
+    'sunset':     'float',
+    'temp':       'float',
+    'uvi':        'float',
+    'visibility': 'float',
+    'wind_deg':   'float',
+    'wind_speed': 'float',
+    'units':      'strIDX',
 }
 
 # {
@@ -65,11 +64,16 @@ _FAHRENHEIT_: str = 'F'
 _KELVIN_:     str = 'K'
 _CELSIUS_:    str = 'C'
 
-_TEMP_CONVERTER_ = {
-    'C2F': lambda t: ((t * 9/5) + 32),
-    'F2C': lambda t: ((t - 32) * 5/9),
-    'C2K': lambda t: (t + 273.15),
-    'K2C': lambda t: (t - 273.15),
+# Units of OpenWeather values for each 'units' setting
+_TEMP_UNITS_ = {
+    'standard': _KELVIN_,
+    'metric':   _CELSIUS_,
+    'imperial': _FAHRENHEIT_,
+}
+_SPEED_UNITS_ = {
+    'standard': 'm/s',
+    'metric':   'm/s',
+    'imperial': 'mph',
 }
 
 _SENSOR_TYPE_: str = 'openweather'
@@ -103,6 +107,23 @@ def _clean_str(inVal):
     return tmpStr if tmpStr != '' else None
 
 
+def _make_unit_map(units) -> dict:
+    units = _clean_str(units) or 'standard'
+    tempUnit = _TEMP_UNITS_.get(units, _KELVIN_)
+
+    return {
+        'clouds':     '%',
+        'dew_point':  tempUnit,
+        'feels_like': tempUnit,
+        'humidity':   '%',
+        'pressure':   'hPa',
+        'temp':       tempUnit,
+        'visibility': 'm',
+        'wind_deg':   'deg',
+        'wind_speed': _SPEED_UNITS_.get(units, 'm/s'),
+    }
+
+
 def _make_OWM_URL_params(settings) -> dict:
     return {
         'appid': settings['apiKey'],
@@ -128,6 +149,7 @@ class Sensor(_SensorBase):
         self._settings = _settings
         self._url = "https://api.openweathermap.org/data/2.5/onecall"
         self._params = _make_OWM_URL_params(_settings)
+        self._units = format_units(_make_unit_map(_settings['units']))
         self._flds = _FIELD_MAP_
 
     def reset(self, attribs=None):
@@ -157,6 +179,13 @@ class Sensor(_SensorBase):
 
         return data
 
+    def limit_repeat(self, repeat):
+        # Runs are capped, so 'no limit' (i.e. 'None' or 0) means max number of runs
+        return min(repeat or _MAX_REPEAT_, _MAX_REPEAT_)
+
+    def hold_time(self, holdTime):
+        return max(holdTime, _MIN_HOLDTIME_)
+
     def get_data(self, attribs=None):
         """
         Get polished weather and environment data by parsing raw OpenWeather data.
@@ -169,7 +198,7 @@ class Sensor(_SensorBase):
         """
         # Check if we need to run this test several times.
         repeat = min(self._parse_attribs(attribs, 'repeat', self._settings['repeat']), _MAX_REPEAT_)
-        holdTime = max(self._parse_attribs(attribs, 'holdTime', self._settings['holdTime']), _MIN_HOLDTIME_)
+        holdTime = self.hold_time(self._parse_attribs(attribs, 'holdTime', self._settings['holdTime']))
 
         response = {
             'timestamp': datetime.utcnow().isoformat(),
@@ -193,7 +222,8 @@ class Sensor(_SensorBase):
                 'main': 'Clouds'
             },
             'wind_deg': 0,
-            'wind_speed': 0
+            'wind_speed': 0,
+            'units': self._units
         }
 
         # Get OpenWeather data
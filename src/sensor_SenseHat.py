@@ -5,6 +5,7 @@ from copy import deepcopy
 from sense_hat import SenseHat
 
 from .sensor_base import _SensorBase
+from .units import convert_records, format_units
 
 # =========================================================
 #                      G L O B A L S
@@ -29,18 +30,36 @@ _FIELD_MAP_ = {
     'gyroX':        'float',
     'gyroY':        'float',
     'gyroZ':        'float',
+    'sampleRate':   'float',
+    'rateReason':   'strIDX',
+    'rateScore':    'float',
+    'units':        'strIDX',
 }
 
 _FAHRENHEIT_: str = 'F'
 _KELVIN_:     str = 'K'
 _CELSIUS_:    str = 'C'
 
-_TEMP_CONVERTER_ = {
-    'C2F': lambda t: ((t * 9/5) + 32),
-    'F2C': lambda t: ((t - 32) * 5/9),
-    'C2K': lambda t: (t + 273.15),
-    'K2C': lambda t: (t - 273.15),
+# Units of values as read from SenseHat
+_UNIT_MAP_ = {
+    'tempDefault':  _CELSIUS_,
+    'tempHumidity': _CELSIUS_,
+    'humidity':     '%',
+    'pressure':     'hPa',
+    'orientPitch':  'deg',
+    'orientRoll':   'deg',
+    'orientYaw':    'deg',
+    'compassX':     'uT',
+    'compassY':     'uT',
+    'compassZ':     'uT',
+    'accelX':       'g',
+    'accelY':       'g',
+    'accelZ':       'g',
+    'gyroX':        'rad/s',
+    'gyroY':        'rad/s',
+    'gyroZ':        'rad/s',
 }
+_UNITS_ = format_units(_UNIT_MAP_)
 
 _SENSOR_TYPE_: str = 'sensehat'
 _SENSOR_NAME_: str = 'SenseHat'
@@ -53,8 +72,108 @@ _DEFAULT_SETTINGS_ = {
     'tempUnit': 'C',    # Temp display unit: 'C' (Celsius), 'F' (Fahrenheit), 'K' (Kelvin)
     'enviro': True,     # Get environmental data (i.e. temperature, humidity, and pressure)
     'IMU': True,        # Get IMU (inertial measurement unit) data (i.e. gyroscope, accelerometer, and magnetometer (compass)
+    'orientation': True,  # Get on-device orientation with IMU data ('False' logs raw IMU only, see 'pipe_IMUFusion')
+    'adaptive': False,  # Adapt sampling rate to how fast values change (replaces 'holdTime' between samples)
+    'minRate': 1/60,    # Min sampling rate (samples/sec) in adaptive mode
+    'maxRate': 10,      # Max sampling rate (samples/sec) in adaptive mode
+    'rateStep': 2,      # Factor by which rate is raised/lowered
+    'highChange': 1.0,  # Raise rate when normalized change/sec is at or above this ...
+    'lowChange': 0.25,  # ... and lower rate when it stays below this ...
+    'settle': 5,        # ... for this many samples in a row
 }
 
+# Change/sec that counts as 'fast' (i.e. normalized change of 1.0) per field
+_RATE_SCALES_ = {
+    'tempDefault':  0.1,    # deg/s
+    'tempHumidity': 0.1,
+    'humidity':     0.5,    # %/s
+    'pressure':     0.1,    # hPa/s
+    'compassX':     5.0,    # uT/s
+    'compassY':     5.0,
+    'compassZ':     5.0,
+    'accelX':       0.05,   # g/s
+    'accelY':       0.05,
+    'accelZ':       0.05,
+    'gyroX':        0.05,   # (rad/s)/s
+    'gyroY':        0.05,
+    'gyroZ':        0.05,
+}
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+class _RateController:
+    """
+    Pick sampling rate based on how fast sensor values change.
+
+    Rate is raised by 'step' as soon as any field changes faster than
+    'high' (normalized by '_RATE_SCALES_'), and lowered by 'step' only after
+    all fields have changed slower than 'low' for 'settle' samples in a row.
+    The gap between 'high' and 'low' (and the 'settle' count) keeps the rate
+    from flapping.
+
+    The reason for the last rate change is one of a small, fixed set of codes
+    ('init', 'lowered', or 'raised:<field>'), so it stays cheap to store as a
+    'strIDX' value. The latest normalized change/sec is kept in 'score'.
+    """
+    def __init__(self, settings):
+        self.minRate = settings['minRate']
+        self.maxRate = max(settings['maxRate'], self.minRate)
+        self.step = max(settings['rateStep'], 1)
+        self.high = settings['highChange']
+        self.low = min(settings['lowChange'], self.high)
+        self.settle = settings['settle']
+
+        self.rate = self.minRate
+        self.reason = 'init'
+        self.score = 0.0
+        self._calm = 0
+        self._prev = None
+
+    def _change(self, record, ts) -> tuple:
+        # Get fastest changing field and its normalized change/sec
+        if self._prev is None:
+            return None, 0.0
+
+        prevTS, prevRec = self._prev
+        elapsed = max(ts - prevTS, 1e-6)
+        fld, score = None, 0.0
+        for key, scale in _RATE_SCALES_.items():
+            val, prev = record.get(key), prevRec.get(key)
+            if not isinstance(val, (int, float)) or not isinstance(prev, (int, float)):
+                continue
+
+            change = abs(val - prev) / elapsed / scale
+            if change > score:
+                fld, score = key, change
+
+        return fld, score
+
+    def update(self, record, ts) -> float:
+        """Update controller with latest record, and return seconds to wait until next sample."""
+        fld, score = self._change(record, ts)
+        self._prev = (ts, record)
+        self.score = score
+
+        if score >= self.high:
+            self._calm = 0
+            if self.rate < self.maxRate:
+                self.rate = min(self.rate * self.step, self.maxRate)
+                self.reason = f"raised:{fld}"
+
+        elif score < self.low:
+            self._calm += 1
+            if self._calm >= self.settle and self.rate > self.minRate:
+                self._calm = 0
+                self.rate = max(self.rate / self.step, self.minRate)
+                self.reason = 'lowered'
+
+        else:
+            self._calm = 0
+
+        return 1 / self.rate
+
 
 # =========================================================
 #        M A I N   C L A S S   D E F I N I T I O N
@@ -71,6 +190,7 @@ class Sensor(_SensorBase):
         self._settings = _settings
         self._sensor = SenseHat()
         self._flds = _FIELD_MAP_
+        self._rate = _RateController(_settings)
 
     def reset(self, attribs=None):
         # There's nothing to 'reset' with this sensor as it is a web service.
@@ -80,6 +200,20 @@ class Sensor(_SensorBase):
         #
         pass
 
+    @property
+    def rate(self):
+        """Current sampling rate (samples/sec) in adaptive mode."""
+        return self._rate.rate
+
+    @property
+    def rate_reason(self):
+        """Reason for last change of sampling rate in adaptive mode ('init', 'lowered', or 'raised:<field>')."""
+        return self._rate.reason
+
+    def hold_time(self, holdTime):
+        """In adaptive mode, wait time between samples is set by rate controller."""
+        return 1 / self._rate.rate if self._settings['adaptive'] else holdTime
+
     def get_data(self, attribs=None):
         """
         Run speed test on current internet connection to get data points for PING, UP-and DOWNLOAD speeds.
@@ -101,8 +235,14 @@ class Sensor(_SensorBase):
         if not doEnviro and not doIMU:
             doEnviro = True
 
+        # On-device orientation runs sensor fusion on every sample, so it can be skipped.
+        doOrient = doIMU and self._parse_attribs(attribs, 'orientation', self._settings['orientation'])
+
         tempUnit = self._parse_attribs(attribs, 'tempUnit', self._settings['tempUnit'])
 
+        # In adaptive mode, wait time between samples is set by rate controller.
+        adaptive = self._parse_attribs(attribs, 'adaptive', self._settings['adaptive'])
+
         # Run the test 'repeat' number of times and store results in data array.
         data = []
 
@@ -129,45 +269,37 @@ class Sensor(_SensorBase):
                 'gyroX': None,
                 'gyroY': None,
                 'gyroZ': None,
+                'units': _UNITS_,
             }
 
             self._sensor.clear()
 
+            # Temperatures are collected in Celsius, and converted for the whole batch below.
             if doEnviro:
-                tempDefault = self._sensor.get_temperature()
-                tempHumidity = self._sensor.get_temperature_from_humidity()
-
-                if tempUnit == _FAHRENHEIT_:
-                    response.update([
-                        ('tempDefault', _TEMP_CONVERTER_['C2F'](tempDefault)),
-                        ('tempHumidity', _TEMP_CONVERTER_['C2F'](tempHumidity))
-                    ])
-                elif tempUnit == _KELVIN_:
-                    response.update([
-                        ('tempDefault', _TEMP_CONVERTER_['C2K'](tempDefault)),
-                        ('tempHumidity', _TEMP_CONVERTER_['C2K'](tempHumidity))
-                    ])
-                else:
-                    response.update([
-                        ('tempDefault', tempDefault),
-                        ('tempHumidity', tempHumidity)
-                    ])
+                response.update([
+                    ('tempDefault', self._sensor.get_temperature()),
+                    ('tempHumidity', self._sensor.get_temperature_from_humidity())
+                ])
 
             response.update([
                 ('humidity', self._sensor.get_humidity()),
                 ('pressure', self._sensor.get_pressure())
             ])
 
-            if doIMU:
+            if doOrient:
                 orient = self._sensor.get_orientation()
+                response.update([
+                    ('orientPitch', orient['pitch']),
+                    ('orientRoll', orient['roll']),
+                    ('orientYaw', orient['yaw']),
+                ])
+
+            if doIMU:
                 compass = self._sensor.get_compass_raw()
                 accel = self._sensor.get_accelerometer_raw()
                 gyro = self._sensor.get_gyroscope_raw()
 
                 response.update([
-                    ('orientPitch', orient['pitch']),
-                    ('orientRoll', orient['roll']),
-                    ('orientYaw', orient['yaw']),
                     ('compassX', compass['x']),
                     ('compassY', compass['y']),
                     ('compassZ', compass['z']),
@@ -179,9 +311,20 @@ class Sensor(_SensorBase):
                     ('gyroZ', gyro['z']),
                 ])
 
+            if adaptive:
+                holdTime = self._rate.update(response, time.monotonic())
+                response.update([
+                    ('sampleRate', self._rate.rate),
+                    ('rateReason', self._rate.reason),
+                    ('rateScore', self._rate.score)
+                ])
+
             data.append(deepcopy(response))
 
             if repeat > 0:
                 time.sleep(holdTime)
 
+        if tempUnit in (_FAHRENHEIT_, _KELVIN_):
+            data = convert_records(data, {'temperature': tempUnit}, _UNIT_MAP_)
+
         return data
@@ -6,6 +6,7 @@ import http.client
 import speedtest
 
 from .sensor_base import _SensorBase
+from .units import convert_records, format_units
 
 # =========================================================
 #                      G L O B A L S
@@ -17,8 +18,17 @@ _FIELD_MAP_ = {
     'ping':       'float',
     'download':   'float',
     'upload':     'float',
+    'units':      'strIDX',
 }
 
+# Units of values as reported by 'speedtest'
+_UNIT_MAP_ = {
+    'ping':     'ms',
+    'download': 'bit/s',
+    'upload':   'bit/s',
+}
+_UNITS_ = format_units(_UNIT_MAP_)
+
 # 'bytes_received': 72082596,
 # 'bytes_sent': 32735232,
 # 'client': {   'country': 'US',
@@ -113,6 +123,13 @@ class Sensor(_SensorBase):
         #
         pass
 
+    def limit_repeat(self, repeat):
+        # Runs are capped, so 'no limit' (i.e. 'None' or 0) means max number of runs
+        return min(repeat or _MAX_REPEAT_, _MAX_REPEAT_)
+
+    def hold_time(self, holdTime):
+        return max(holdTime, _MIN_HOLDTIME_)
+
     def get_data(self, attribs=None):
         """
         Run speed test on current internet connection to get data points for PING, UP-and DOWNLOAD speeds.
@@ -125,7 +142,7 @@ class Sensor(_SensorBase):
         """
         # Check if we need to run this test several times.
         repeat = min(self._parse_attribs(attribs, 'repeat', self._settings['repeat']), _MAX_REPEAT_)
-        holdTime = max(self._parse_attribs(attribs, 'holdTime', self._settings['holdTime']), _MIN_HOLDTIME_)
+        holdTime = self.hold_time(self._parse_attribs(attribs, 'holdTime', self._settings['holdTime']))
 
         # If we want to run test against a specific server,
         # then add server ID
@@ -160,7 +177,8 @@ class Sensor(_SensorBase):
                 'locationTZ': self._parse_attribs(attribs, 'locationTZ', self._settings['locationTZ']),
                 'ping': 0.0,
                 'download': 0.0,
-                'upload': 0.0
+                'upload': 0.0,
+                'units': _UNITS_
             }
 
             try:
@@ -190,4 +208,7 @@ class Sensor(_SensorBase):
             if repeat > 0:
                 time.sleep(holdTime)
 
+        if self._parse_attribs(attribs, 'unit', self._settings['unit']) == 'bytes':
+            data = convert_records(data, {'rate': 'byte/s'}, _UNIT_MAP_)
+
         return data
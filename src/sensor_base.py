@@ -1,4 +1,43 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def to_records(data) -> list:
+    """
+    Normalize sensor output to a list of records.
+
+    Some sensors return a single dict record from 'get_data()' while
+    others return a list of records (i.e. when 'repeat' > 1).
+    """
+    if data is None:
+        return []
+
+    return [data] if isinstance(data, dict) else list(data)
+
+
+def to_epoch(ts) -> float:
+    """
+    Convert record timestamp to seconds since epoch (UTC).
+
+    Sensors stamp records with 'datetime.utcnow().isoformat()', so naive
+    ISO strings are treated as UTC. Numeric values are passed through.
+    """
+    if isinstance(ts, (int, float)):
+        return float(ts)
+
+    stamp = datetime.fromisoformat(str(ts).replace('Z', '+00:00'))
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+
+    return stamp.timestamp()
+
+
+def from_epoch(ts: float) -> str:
+    """Convert seconds since epoch to the (naive UTC) ISO format used in records."""
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
 
 
 # =========================================================
@@ -9,6 +48,7 @@ class _SensorBase(ABC):
         self._type = sensorType
         self._name = name
         self._desc = description
+        self._flds = {}
 
     def __str__(self):
         return f"{self._type}"
@@ -35,6 +75,18 @@ class _SensorBase(ABC):
     def description(self):
         return self._desc
 
+    @property
+    def fields(self):
+        return self._flds
+
+    def limit_repeat(self, repeat):
+        """Get number of reads allowed for requested 'repeat' ('None' or 0 means no limit)."""
+        return repeat
+
+    def hold_time(self, holdTime):
+        """Get seconds to wait before next read for requested 'holdTime'."""
+        return holdTime
+
     @abstractmethod
     def reset(self, attribs=None):
         pass
@@ -0,0 +1,226 @@
+import json
+import time
+import zlib
+import threading
+from collections import deque
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from .sensor_base import to_records, to_epoch
+from .pipe_Aggregate import summarize
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_HOST_:      str = '127.0.0.1'
+_PORT_:      int = 8080
+_REFRESH_:   int = 60           # Seconds between sensor reads
+_RETENTION_: int = 1440         # Number of records kept per sensor
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+class Collector:
+    """
+    Background thread that reads a sensor every 'refresh' seconds and keeps
+    the last 'retention' records in a ring buffer.
+    """
+    def __init__(self, sensor, refresh=_REFRESH_, retention=_RETENTION_):
+        self._sensor = sensor
+        self._refresh = refresh
+        self._buf = deque(maxlen=retention)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"collector-{sensor.type}", daemon=True)
+        self._seq = 0
+        self._modified = None
+        self._error = None
+        self._stats = (None, None)
+
+    @property
+    def sensor(self):
+        return self._sensor
+
+    @property
+    def error(self):
+        """Error message from latest failed sensor read (if any)."""
+        return self._error
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def collect(self):
+        """Read sensor once and add record(s) to ring buffer."""
+        try:
+            records = to_records(self._sensor.get_data({'repeat': 1}))
+        except Exception as e:
+            with self._lock:
+                self._seq += 1
+                self._error = str(e)
+            return
+
+        with self._lock:
+            self._buf.extend((to_epoch(rec['timestamp']), rec) for rec in records)
+            self._seq += 1
+            self._modified = time.time()
+            self._error = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.collect()
+            self._stop.wait(self._refresh)
+
+    def version(self) -> tuple:
+        """Get (sequence number, last modified time) of ring buffer."""
+        with self._lock:
+            return self._seq, self._modified
+
+    def latest(self):
+        with self._lock:
+            return self._buf[-1][1] if self._buf else None
+
+    def range(self, start=None, end=None) -> list:
+        with self._lock:
+            return [
+                rec for ts, rec in self._buf
+                if (start is None or ts >= start) and (end is None or ts < end)
+            ]
+
+    def stats(self) -> dict:
+        # Stats only change when the buffer does, so cache them per sequence number.
+        seq, stats = self._stats
+        if seq != self._seq:
+            with self._lock:
+                seq = self._seq
+                records = [rec for _, rec in self._buf]
+
+            stats = {
+                'count': len(records),
+                'first': records[0]['timestamp'] if records else None,
+                'last': records[-1]['timestamp'] if records else None,
+                **summarize(records, self._sensor.fields),
+            }
+            self._stats = (seq, stats)
+
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'sensorMod'
+
+    def log_message(self, format, *args):
+        # Keep stdout clean, as the CLI may be writing records to it
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = b'' if body is None else json.dumps(body, default=str).encode()
+        self.send_response(status)
+        for key, val in (headers or {}).items():
+            self.send_header(key, val)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _is_fresh(self, etag, modified) -> bool:
+        match = self.headers.get('If-None-Match')
+        if match is not None:
+            return etag in [tag.strip() for tag in match.split(',')] or match.strip() == '*'
+
+        since = self.headers.get('If-Modified-Since')
+        if since is not None and modified is not None:
+            try:
+                return int(modified) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: vals[-1] for key, vals in parse_qs(url.query).items()}
+        collectors = self.server.collectors
+
+        if url.path not in ('/latest', '/range', '/stats'):
+            return self._send(404, {'error': f"Unknown path '{url.path}'"})
+
+        names = [query['sensor']] if 'sensor' in query else list(collectors)
+        unknown = [name for name in names if name not in collectors]
+        if unknown:
+            return self._send(404, {'error': f"Unknown sensor '{unknown[0]}'"})
+
+        try:
+            start = to_epoch(query['start']) if 'start' in query else None
+            end = to_epoch(query['end']) if 'end' in query else None
+        except ValueError as e:
+            return self._send(400, {'error': str(e)})
+
+        versions = {name: collectors[name].version() for name in names}
+        modified = max((mod for _, mod in versions.values() if mod is not None), default=None)
+        etag = '"' + '-'.join(f"{name}.{seq}" for name, (seq, _) in versions.items()) + '"'
+        if url.query:
+            etag = etag[:-1] + f"-{zlib.crc32(url.query.encode()):08x}" + '"'
+
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if modified is not None:
+            headers['Last-Modified'] = formatdate(modified, usegmt=True)
+
+        if self._is_fresh(etag, modified):
+            return self._send(304, headers=headers)
+
+        if url.path == '/latest':
+            body = {name: collectors[name].latest() for name in names}
+        elif url.path == '/range':
+            body = {name: collectors[name].range(start, end) for name in names}
+        else:
+            body = {
+                name: {**collectors[name].stats(), 'error': collectors[name].error}
+                for name in names
+            }
+
+        self._send(200, body, headers)
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class Server(ThreadingHTTPServer):
+    """
+    Local HTTP server for latest and recent sensor readings.
+
+    Requests are answered from the collectors' ring buffers and never wait on
+    a sensor. Endpoints (all take optional 'sensor=<type>'):
+
+        /latest                     -- latest record
+        /range?start=...&end=...    -- records where 'start' <= timestamp < 'end'
+        /stats                      -- count/mean/min/max/variance/last per numeric field
+
+    Responses carry 'ETag' and 'Last-Modified' headers, and conditional GETs
+    ('If-None-Match' or 'If-Modified-Since') get '304 Not Modified' until a
+    sensor has new data.
+    """
+    daemon_threads = True
+
+    def __init__(self, collectors, host=_HOST_, port=_PORT_):
+        super().__init__((host, port), _Handler)
+        self.collectors = {col.sensor.type: col for col in collectors}
+
+    def serve(self):
+        """Start collectors and handle requests until interrupted."""
+        for col in self.collectors.values():
+            col.start()
+
+        try:
+            self.serve_forever()
+        finally:
+            for col in self.collectors.values():
+                col.stop(timeout=1)
+            self.server_close()
@@ -0,0 +1,286 @@
+import os
+import json
+import zlib
+import struct
+import threading
+
+from .sensor_base import to_records
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_SEGMENT_EXT_:  str = '.wal'
+_CURSOR_FILE_:  str = 'cursor.json'
+_FRAME_HDR_ = struct.Struct('<II')     # (payload length, CRC32 of payload)
+
+_SEGMENT_SIZE_: int = 4 * 1024 * 1024  # Roll over to new segment after 4 MB
+_MAX_BYTES_:    int = 64 * 1024 * 1024 # Drop oldest segments beyond 64 MB on disk
+_BATCH_SIZE_:   int = 500              # Max records per forwarded batch
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _encode(record) -> bytes:
+    payload = json.dumps(record, separators=(',', ':'), default=str).encode()
+    return _FRAME_HDR_.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_frame(fh):
+    """Read next frame from segment. Returns 'None' at end or at torn/corrupt tail."""
+    hdr = fh.read(_FRAME_HDR_.size)
+    if len(hdr) < _FRAME_HDR_.size:
+        return None
+
+    size, crc = _FRAME_HDR_.unpack(hdr)
+    payload = fh.read(size)
+    if len(payload) < size or zlib.crc32(payload) != crc:
+        return None
+
+    return payload
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class Spool:
+    """
+    Durable store-and-forward spool between sensors and network sinks.
+
+    Records are appended to a segmented write-ahead log on disk, and are
+    only removed once a sink has accepted them. Fully acknowledged segments
+    are deleted, and if the spool grows beyond 'maxBytes' then the oldest
+    segments are dropped (whether forwarded or not). Only the current batch
+    is ever held in memory.
+    """
+    def __init__(self, path, segmentSize=_SEGMENT_SIZE_, maxBytes=_MAX_BYTES_, sync=False):
+        self._path = path
+        self._segmentSize = segmentSize
+        self._maxBytes = max(maxBytes, segmentSize)
+        self._sync = sync
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+        os.makedirs(path, exist_ok=True)
+
+        self._segments = {
+            int(fName[:-len(_SEGMENT_EXT_)]): os.path.getsize(os.path.join(path, fName))
+            for fName in os.listdir(path) if fName.endswith(_SEGMENT_EXT_)
+        }
+        if not self._segments:
+            self._segments[1] = 0
+            open(self._file(1), 'ab').close()
+
+        self._active = max(self._segments)
+        self._repair(self._active)
+        self._fh = open(self._file(self._active), 'ab')
+        self._cursor = self._load_cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def dropped(self):
+        """Number of records dropped (unsent) due to 'maxBytes' cap."""
+        return self._dropped
+
+    @property
+    def size(self):
+        """Total number of bytes in spool on disk."""
+        return sum(self._segments.values())
+
+    @property
+    def pending(self):
+        """Number of bytes not yet forwarded and acknowledged."""
+        seg, offset = self._cursor
+        return sum(size for sid, size in self._segments.items() if sid >= seg) - offset
+
+    # -----------------------------------------------------
+    #  Segment & cursor helpers
+    # -----------------------------------------------------
+    def _file(self, segment):
+        return os.path.join(self._path, f"{segment:010d}{_SEGMENT_EXT_}")
+
+    def _repair(self, segment):
+        # Truncate torn frame at tail of segment left behind by a crash.
+        good = 0
+        with open(self._file(segment), 'rb') as fh:
+            while (payload := _read_frame(fh)) is not None:
+                good += _FRAME_HDR_.size + len(payload)
+
+        if good != self._segments[segment]:
+            with open(self._file(segment), 'ab') as fh:
+                fh.truncate(good)
+            self._segments[segment] = good
+
+    def _load_cursor(self) -> tuple:
+        cursor = (min(self._segments), 0)
+        fName = os.path.join(self._path, _CURSOR_FILE_)
+        if os.path.exists(fName):
+            with open(fName) as fh:
+                data = json.load(fh)
+            cursor = max(cursor, (data['segment'], data['offset']))
+
+        return cursor
+
+    def _save_cursor(self):
+        fName = os.path.join(self._path, _CURSOR_FILE_)
+        with open(fName + '.tmp', 'w') as fh:
+            json.dump({'segment': self._cursor[0], 'offset': self._cursor[1]}, fh)
+            if self._sync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(fName + '.tmp', fName)
+
+    def _roll(self):
+        self._fh.close()
+        self._active += 1
+        self._segments[self._active] = 0
+        self._fh = open(self._file(self._active), 'ab')
+
+    def _count(self, segment, offset) -> int:
+        num = 0
+        with open(self._file(segment), 'rb') as fh:
+            fh.seek(offset)
+            while _read_frame(fh) is not None:
+                num += 1
+        return num
+
+    def _compact(self):
+        # Delete segments that are fully acknowledged, and then drop oldest
+        # segments while spool is over its size cap.
+        seg, offset = self._cursor
+        for sid in sorted(self._segments):
+            if sid >= seg or sid == self._active:
+                break
+            os.remove(self._file(sid))
+            del self._segments[sid]
+
+        while self.size > self._maxBytes and len(self._segments) > 1:
+            sid = min(self._segments)
+            if sid >= self._cursor[0]:
+                self._dropped += self._count(sid, self._cursor[1] if sid == self._cursor[0] else 0)
+            os.remove(self._file(sid))
+            del self._segments[sid]
+            self._cursor = max(self._cursor, (min(self._segments), 0))
+
+        self._save_cursor()
+
+    # -----------------------------------------------------
+    #  Public API
+    # -----------------------------------------------------
+    def put(self, data) -> int:
+        """
+        Append sensor record(s) to spool.
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            Number of records appended.
+        """
+        records = to_records(data)
+
+        with self._lock:
+            for rec in records:
+                frame = _encode(rec)
+                if self._segments[self._active] and self._segments[self._active] + len(frame) > self._segmentSize:
+                    self._roll()
+
+                self._fh.write(frame)
+                self._segments[self._active] += len(frame)
+
+            self._fh.flush()
+            if self._sync:
+                os.fsync(self._fh.fileno())
+
+            if self.size > self._maxBytes:
+                self._compact()
+
+        return len(records)
+
+    def batches(self, batchSize=_BATCH_SIZE_):
+        """
+        Iterate over pending records in batches, starting at current cursor.
+
+        Yields:
+            Tuple with list of records and the cursor position just after the
+            batch, which can be passed to 'ack()' once batch is delivered.
+        """
+        seg, offset = self._cursor
+        batch = []
+
+        while seg in self._segments:
+            try:
+                fh = open(self._file(seg), 'rb')
+            except FileNotFoundError:
+                return
+
+            with fh:
+                fh.seek(offset)
+                while (payload := _read_frame(fh)) is not None:
+                    batch.append(json.loads(payload))
+                    offset += _FRAME_HDR_.size + len(payload)
+                    if len(batch) >= batchSize:
+                        yield batch, (seg, offset)
+                        batch = []
+
+            if seg >= self._active:
+                break
+            seg, offset = seg + 1, 0
+
+        if batch:
+            yield batch, (seg, offset)
+
+    def ack(self, cursor):
+        """Mark all records up to 'cursor' as delivered, and compact spool."""
+        seg, offset = cursor
+        with self._lock:
+            if seg < self._active and offset >= self._segments.get(seg, 0):
+                seg, offset = seg + 1, 0
+
+            self._cursor = max(self._cursor, (seg, offset))
+            self._compact()
+
+    def forward(self, sink, batchSize=_BATCH_SIZE_, maxBatches=None) -> int:
+        """
+        Forward pending records to sink in batches.
+
+        Forwarding stops at the first batch that the sink fails to accept,
+        and that batch will be sent again on the next call.
+
+        Args:
+            sink: Callable that accepts a list of records, and raises 'OSError'
+                  (e.g. 'ConnectionError') if records could not be delivered.
+            batchSize: Max number of records per batch.
+            maxBatches: Max number of batches to send, or 'None' for all.
+
+        Returns:
+            Number of records forwarded.
+        """
+        num = 0
+        for idx, (batch, cursor) in enumerate(self.batches(batchSize)):
+            if maxBatches is not None and idx >= maxBatches:
+                break
+
+            try:
+                sink(batch)
+            except OSError:
+                break
+
+            self.ack(cursor)
+            num += len(batch)
+
+        return num
+
+    def close(self):
+        with self._lock:
+            self._fh.close()
+            self._save_cursor()
@@ -0,0 +1,328 @@
+import os
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+from .sensor_base import to_records, to_epoch
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_META_FILE_:  str = 'meta.json'
+_TS_FIELD_:   str = 'timestamp'
+_TS_COLUMN_:  str = 'timestamp.f64'
+_TS_INDEX_:   str = 'timestamp.idx'
+
+_FLOAT_EXT_:  str = '.f64'          # One float64 per row
+_CODE_EXT_:   str = '.u32'          # One uint32 dictionary code per row
+_DICT_EXT_:   str = '.dict'         # One JSON string per line, line number == code
+
+_FLOAT_TYPE_: str = 'd'
+_CODE_TYPE_:  str = 'I'
+_INDEX_FMT_ = struct.Struct('<dQ')  # (timestamp, row) for every 'blockSize' row
+
+_NONE_CODE_:  int = 0               # Dictionary code reserved for 'None'
+
+_BLOCK_SIZE_: int = 256             # Rows between sparse index entries
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+def _file_size(fName) -> int:
+    return os.path.getsize(fName) if os.path.exists(fName) else 0
+
+
+def _to_float(inVal) -> float:
+    return float('nan') if inVal is None else float(inVal)
+
+
+# =========================================================
+#        M A I N   C L A S S   D E F I N I T I O N
+# =========================================================
+class Store:
+    """
+    Append-only on-disk time-series store for sensor records.
+
+    Each 'float' field in the sensor '_FIELD_MAP_' is kept in its own column
+    file, and each 'strIDX' field is kept as a column of codes into a
+    dictionary file. Record timestamps are kept as a float64 (epoch) column
+    with a sparse index of every 'blockSize' row so that range scans only
+    touch the pages they need. Columns are read via 'mmap' and returned as
+    read-only 'memoryview' slices (i.e. no copying or parsing).
+
+    Records must be ingested in timestamp order.
+    """
+    def __init__(self, path, fields=None, blockSize=_BLOCK_SIZE_):
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._load_meta()
+        if meta is None:
+            if not fields:
+                raise ValueError(f"Missing field map for new time-series store '{path}'!")
+
+            meta = {'fields': dict(fields), 'blockSize': int(blockSize)}
+            with open(self._file(_META_FILE_), 'w') as fh:
+                json.dump(meta, fh)
+
+        elif fields and dict(fields) != meta['fields']:
+            raise ValueError(f"Field map does not match existing time-series store '{path}'!")
+
+        self._flds = meta['fields']
+        self._blockSize = meta['blockSize']
+        self._floatFlds = [fld for fld, typ in self._flds.items() if typ == 'float']
+        self._strFlds = [fld for fld, typ in self._flds.items() if typ == 'strIDX' and fld != _TS_FIELD_]
+
+        self._maps = {}
+        self._fh = {}
+
+        self._rows = self._recover()
+        self._strings = {fld: self._load_dict(fld) for fld in self._strFlds}
+        self._codes = {fld: {val: idx for idx, val in enumerate(vals)} for fld, vals in self._strings.items()}
+        self._index = self._load_index()
+        self._lastTS = self._column(_TS_COLUMN_, _FLOAT_TYPE_)[-1] if self._rows else float('-inf')
+
+    def __len__(self):
+        return self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def for_sensor(cls, sensor, root, blockSize=_BLOCK_SIZE_):
+        """Open (or create) store for a given sensor under 'root/<sensor type>'."""
+        return cls(os.path.join(root, sensor.type), sensor.fields, blockSize)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def fields(self):
+        return self._flds
+
+    # -----------------------------------------------------
+    #  File & recovery helpers
+    # -----------------------------------------------------
+    def _file(self, name):
+        return os.path.join(self._path, name)
+
+    def _columns(self):
+        cols = [(_TS_COLUMN_, _FLOAT_TYPE_)]
+        cols += [(fld + _FLOAT_EXT_, _FLOAT_TYPE_) for fld in self._floatFlds]
+        cols += [(fld + _CODE_EXT_, _CODE_TYPE_) for fld in self._strFlds]
+        return cols
+
+    def _load_meta(self):
+        fName = self._file(_META_FILE_)
+        if not os.path.exists(fName):
+            return None
+
+        with open(fName) as fh:
+            return json.load(fh)
+
+    def _recover(self) -> int:
+        # A crash during 'ingest()' may leave some columns longer than
+        # others. We trust only the rows that made it into every column.
+        cols = self._columns()
+        rows = min(_file_size(self._file(name)) // array(typ).itemsize for name, typ in cols)
+
+        for name, typ in cols:
+            fName = self._file(name)
+            with open(fName, 'ab') as fh:
+                fh.truncate(rows * array(typ).itemsize)
+
+        return rows
+
+    def _load_dict(self, fld) -> list:
+        fName = self._file(fld + _DICT_EXT_)
+        if not os.path.exists(fName):
+            with open(fName, 'w') as fh:
+                fh.write(json.dumps(None) + '\n')
+
+        vals = []
+        good = 0
+        with open(fName, 'rb') as fh:
+            for line in fh:
+                if not line.endswith(b'\n'):
+                    break
+                vals.append(json.loads(line))
+                good += len(line)
+
+        # Drop partial trailing entry left behind by a crash
+        if good != _file_size(fName):
+            with open(fName, 'ab') as fh:
+                fh.truncate(good)
+
+        return vals
+
+    def _load_index(self) -> tuple:
+        fName = self._file(_TS_INDEX_)
+        expected = (self._rows + self._blockSize - 1) // self._blockSize
+
+        keys, rows = [], []
+        if os.path.exists(fName) and _file_size(fName) == expected * _INDEX_FMT_.size:
+            with open(fName, 'rb') as fh:
+                for key, row in _INDEX_FMT_.iter_unpack(fh.read()):
+                    keys.append(key)
+                    rows.append(row)
+            return keys, rows
+
+        # Index is out of sync with timestamp column, so rebuild it.
+        tsCol = self._column(_TS_COLUMN_, _FLOAT_TYPE_)
+        with open(fName, 'wb') as fh:
+            for row in range(0, self._rows, self._blockSize):
+                keys.append(tsCol[row])
+                rows.append(row)
+                fh.write(_INDEX_FMT_.pack(tsCol[row], row))
+
+        return keys, rows
+
+    def _writer(self, name):
+        if name not in self._fh:
+            self._fh[name] = open(self._file(name), 'ab')
+        return self._fh[name]
+
+    def _column(self, name, typ) -> memoryview:
+        need = self._rows * array(typ).itemsize
+        if need == 0:
+            return memoryview(array(typ))
+
+        size, view = self._maps.get(name, (0, None))
+        if size < need:
+            # Columns only grow, so remapping is needed only after an 'ingest()'.
+            # Old maps stay valid for as long as callers hold views into them.
+            with open(self._file(name), 'rb') as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            size = len(mm)
+            view = memoryview(mm).cast(typ)
+            self._maps[name] = (size, view)
+
+        return view[:self._rows]
+
+    def _encode(self, fld, inVal) -> int:
+        if inVal is None:
+            return _NONE_CODE_
+
+        val = str(inVal)
+        code = self._codes[fld].get(val)
+        if code is None:
+            code = len(self._strings[fld])
+            self._strings[fld].append(val)
+            self._codes[fld][val] = code
+            self._writer(fld + _DICT_EXT_).write((json.dumps(val) + '\n').encode())
+
+        return code
+
+    def _locate(self, ts) -> int:
+        # Use sparse index to find block, then binary search inside block.
+        keys, rows = self._index
+        idx = bisect_left(keys, ts)
+        lo = rows[idx - 1] if idx > 0 else 0
+        hi = rows[idx] if idx < len(rows) else self._rows
+
+        return bisect_left(self._column(_TS_COLUMN_, _FLOAT_TYPE_), ts, lo, hi)
+
+    # -----------------------------------------------------
+    #  Public API
+    # -----------------------------------------------------
+    def ingest(self, data) -> int:
+        """
+        Append sensor record(s) to store.
+
+        Args:
+            data: Single record or list of records (i.e. output from 'get_data()').
+
+        Returns:
+            Number of records appended.
+
+        Raises:
+            ValueError: If records are not in timestamp order.
+        """
+        records = to_records(data)
+        if not records:
+            return 0
+
+        stamps = array(_FLOAT_TYPE_, (to_epoch(rec[_TS_FIELD_]) for rec in records))
+        lastTS = self._lastTS
+        for ts in stamps:
+            if ts < lastTS:
+                raise ValueError("Time-series store is append-only and records must be in timestamp order!")
+            lastTS = ts
+
+        for fld in self._floatFlds:
+            col = array(_FLOAT_TYPE_, (_to_float(rec.get(fld)) for rec in records))
+            self._writer(fld + _FLOAT_EXT_).write(col.tobytes())
+
+        for fld in self._strFlds:
+            col = array(_CODE_TYPE_, (self._encode(fld, rec.get(fld)) for rec in records))
+            self._writer(fld + _CODE_EXT_).write(col.tobytes())
+
+        # Timestamp column goes last, and then index entries for new blocks.
+        self._writer(_TS_COLUMN_).write(stamps.tobytes())
+
+        keys, rows = self._index
+        first = self._rows
+        for row in range(-(-first // self._blockSize) * self._blockSize, first + len(stamps), self._blockSize):
+            keys.append(stamps[row - first])
+            rows.append(row)
+            self._writer(_TS_INDEX_).write(_INDEX_FMT_.pack(stamps[row - first], row))
+
+        self.flush()
+        self._rows += len(stamps)
+        self._lastTS = lastTS
+
+        return len(stamps)
+
+    def flush(self):
+        # Dictionary entries must hit the disk before codes that refer to them.
+        for name in sorted(self._fh, key=lambda n: not n.endswith(_DICT_EXT_)):
+            self._fh[name].flush()
+
+    def scan(self, start=None, end=None, fields=None) -> dict:
+        """
+        Get columns for all records where 'start' <= timestamp < 'end'.
+
+        Args:
+            start: Start timestamp (ISO string or epoch), or 'None' for first record.
+            end: End timestamp (ISO string or epoch), or 'None' for last record.
+            fields: List of fields to get. Default is all fields.
+
+        Returns:
+            Dict with read-only 'memoryview' per field. Timestamps are epoch
+            floats, 'float' fields are floats ('nan' for missing values), and
+            'strIDX' fields are dictionary codes (see 'decode()').
+        """
+        lo = 0 if start is None else self._locate(to_epoch(start))
+        hi = self._rows if end is None else self._locate(to_epoch(end))
+        hi = max(lo, hi)
+
+        data = {_TS_FIELD_: self._column(_TS_COLUMN_, _FLOAT_TYPE_)[lo:hi]}
+        for fld in (self._flds if fields is None else fields):
+            if fld in self._floatFlds:
+                data[fld] = self._column(fld + _FLOAT_EXT_, _FLOAT_TYPE_)[lo:hi]
+            elif fld in self._strFlds:
+                data[fld] = self._column(fld + _CODE_EXT_, _CODE_TYPE_)[lo:hi]
+
+        return data
+
+    def strings(self, fld) -> list:
+        """Get dictionary for 'strIDX' field (i.e. code is index into list)."""
+        return self._strings[fld]
+
+    def decode(self, fld, codes) -> list:
+        """Convert column of dictionary codes back to strings."""
+        vals = self._strings[fld]
+        return [vals[code] for code in codes]
+
+    def close(self):
+        for fh in self._fh.values():
+            fh.close()
+        self._fh = {}
+        self._maps = {}
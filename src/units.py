@@ -0,0 +1,208 @@
+from array import array
+from fractions import Fraction as F
+from functools import lru_cache
+
+# =========================================================
+#                      G L O B A L S
+# =========================================================
+_UNITS_FIELD_: str = 'units'
+
+# Unit -> (quantity, scale, offset) where 'base unit value = value * scale + offset'.
+# Base units are: C, hPa, m/s, and bit/s. Factors are exact fractions so that
+# combined factors (e.g. C -> F) don't pick up rounding errors.
+_UNITS_ = {
+    # Temperature
+    'C':        ('temperature', F(1), F(0)),
+    'K':        ('temperature', F(1), F('-273.15')),
+    'F':        ('temperature', F(5, 9), F(-160, 9)),
+
+    # Pressure
+    'hPa':      ('pressure', F(1), F(0)),
+    'Pa':       ('pressure', F('0.01'), F(0)),
+    'kPa':      ('pressure', F(10), F(0)),
+    'mbar':     ('pressure', F(1), F(0)),
+    'inHg':     ('pressure', F('33.8638866667'), F(0)),
+    'mmHg':     ('pressure', F('1.33322387415'), F(0)),
+
+    # Wind speed
+    'm/s':      ('speed', F(1), F(0)),
+    'km/h':     ('speed', F(10, 36), F(0)),
+    'mph':      ('speed', F('0.44704'), F(0)),
+    'kn':       ('speed', F(1852, 3600), F(0)),
+
+    # Data rate
+    'bit/s':    ('rate', F(1), F(0)),
+    'kbit/s':   ('rate', F(1000), F(0)),
+    'Mbit/s':   ('rate', F(1000000), F(0)),
+    'byte/s':   ('rate', F(8), F(0)),
+    'kB/s':     ('rate', F(8000), F(0)),
+    'MB/s':     ('rate', F(8000000), F(0)),
+}
+_QUANTITIES_ = {qty for qty, _, _ in _UNITS_.values()}
+
+
+# =========================================================
+#              H E L P E R   F U N C T I O N S
+# =========================================================
+@lru_cache(maxsize=None)
+def _affine(fromUnit, toUnit) -> tuple:
+    if fromUnit == toUnit:
+        return 1.0, 0.0
+
+    if fromUnit not in _UNITS_ or toUnit not in _UNITS_:
+        raise ValueError(f"Unknown unit '{fromUnit if fromUnit not in _UNITS_ else toUnit}'!")
+
+    fromQty, fromScale, fromOffset = _UNITS_[fromUnit]
+    toQty, toScale, toOffset = _UNITS_[toUnit]
+    if fromQty != toQty:
+        raise ValueError(f"Unable to convert '{fromUnit}' ({fromQty}) to '{toUnit}' ({toQty})!")
+
+    return float(fromScale / toScale), float((fromOffset - toOffset) / toScale)
+
+
+def quantity(unit):
+    """Get quantity (e.g. 'temperature') for unit, or 'None' if unit is unknown."""
+    return _UNITS_[unit][0] if unit in _UNITS_ else None
+
+
+def convert(values, fromUnit, toUnit):
+    """
+    Convert value or whole column of values between units.
+
+    All supported conversions are 'value * scale + offset', so a column is
+    converted in one pass. NumPy arrays (or anything else that supports
+    arithmetic on the whole column) are converted without a Python loop,
+    'array' columns stay 'array' columns, and other sequences become lists
+    where 'None' values are kept as 'None'.
+
+    Raises:
+        ValueError: If either unit is unknown or they measure different quantities.
+    """
+    scale, offset = _affine(fromUnit, toUnit)
+    if scale == 1.0 and offset == 0.0:
+        return values
+
+    if values is None:
+        return None
+    if isinstance(values, (int, float)):
+        return values * scale + offset
+    if hasattr(values, '__array__'):
+        return values * scale + offset
+    if isinstance(values, (array, memoryview)):
+        return array('d', (val * scale + offset for val in values))
+
+    return [None if val is None else val * scale + offset for val in values]
+
+
+def quantities(unitMap) -> dict:
+    """Get quantity per field for a field->unit map (fields with unknown units are left out)."""
+    return {fld: quantity(unit) for fld, unit in unitMap.items() if quantity(unit) is not None}
+
+
+def format_units(unitMap) -> str:
+    """
+    Create compact units spec (e.g. 'temperature=C;pressure=hPa') for a field->unit map.
+
+    The spec is keyed by quantity (rather than by field), so it stays short
+    no matter how many fields a sensor has. Fields with units that can't be
+    converted (e.g. '%' or 'deg') are not part of the spec.
+
+    Raises:
+        ValueError: If fields of the same quantity have different units.
+    """
+    spec = {}
+    for fld, qty in quantities(unitMap).items():
+        if spec.setdefault(qty, unitMap[fld]) != unitMap[fld]:
+            raise ValueError(f"Field '{fld}' is in '{unitMap[fld]}', but other {qty} fields are in '{spec[qty]}'!")
+
+    return _format_spec(spec)
+
+
+def _format_spec(spec) -> str:
+    return ';'.join(f"{qty}={unit}" for qty, unit in spec.items())
+
+
+@lru_cache(maxsize=256)
+def parse_units(spec) -> dict:
+    """Parse units spec created by 'format_units()' into a quantity->unit map."""
+    if not spec:
+        return {}
+
+    return dict(item.split('=', 1) for item in spec.split(';'))
+
+
+def _targets(unitMap, targets) -> dict:
+    # Targets may be given per field (e.g. 'tempDefault') or per quantity (e.g. 'temperature')
+    out = {}
+    for fld, unit in unitMap.items():
+        target = targets.get(fld, targets.get(quantity(unit)))
+        if target is not None and target != unit:
+            out[fld] = target
+
+    return out
+
+
+def convert_columns(columns, unitMap, targets) -> tuple:
+    """
+    Convert columnar batch (e.g. from 'Store.scan()').
+
+    Args:
+        columns: Dict with column per field.
+        unitMap: Dict with current unit per field.
+        targets: Dict with target unit per field and/or per quantity,
+                 e.g. {'temperature': 'F', 'download': 'Mbit/s'}.
+
+    Returns:
+        Tuple with new columns dict and new unit map.
+    """
+    columns = dict(columns)
+    unitMap = dict(unitMap)
+    for fld, unit in _targets(unitMap, targets).items():
+        if fld in columns:
+            columns[fld] = convert(columns[fld], unitMap[fld], unit)
+            unitMap[fld] = unit
+
+    return columns, unitMap
+
+
+def convert_records(records, targets, unitMap) -> list:
+    """
+    Convert sensor records to target units.
+
+    Records carry the current unit per quantity in a 'units' spec field. Records
+    are grouped by spec (normally there is only one), and each field is then
+    converted as a whole column.
+
+    Args:
+        records: List of records.
+        targets: Dict with target unit per quantity, e.g. {'temperature': 'F'}.
+        unitMap: Dict with unit (or quantity) per field, e.g. sensor '_UNIT_MAP_'.
+                 Only used to tell which fields hold which quantity.
+
+    Returns:
+        List of new records with converted values and updated 'units' spec.
+    """
+    fldQty = {fld: unit if unit in _QUANTITIES_ else quantity(unit) for fld, unit in unitMap.items()}
+
+    groups = {}
+    for idx, rec in enumerate(records):
+        groups.setdefault(rec.get(_UNITS_FIELD_), []).append(idx)
+
+    out = list(records)
+    for spec, idxs in groups.items():
+        specMap = parse_units(spec)
+        convs = {qty: unit for qty, unit in targets.items() if qty in specMap and specMap[qty] != unit}
+        if not convs:
+            continue
+
+        newSpec = _format_spec({**specMap, **convs})
+        cols = {
+            fld: convert([records[idx].get(fld) for idx in idxs], specMap[qty], convs[qty])
+            for fld, qty in fldQty.items() if qty in convs
+        }
+        for pos, idx in enumerate(idxs):
+            rec = {**records[idx], _UNITS_FIELD_: newSpec}
+            rec.update((fld, col[pos]) for fld, col in cols.items())
+            out[idx] = rec
+
+    return out
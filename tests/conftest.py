@@ -19,6 +19,28 @@ class Helpers:
                 print('LINE #: {}\n'.format(getframeinfo(frame).lineno))
             _PP_.pprint(data)
 
+    @staticmethod
+    def make_records(vals, step=60.0, start=1600000000.0, location='lab'):
+        """
+        Create sensor records for 'valid_fields' with epoch timestamps 'step' secs apart.
+
+        Each value is either a '(humidity, pressure)' tuple, or a single number used
+        for 'humidity' (with 'pressure' = 1000 + value), or 'None' for missing values.
+        If 'location' is a tuple, records cycle through its values.
+        """
+        records = []
+        for i, val in enumerate(vals):
+            humidity, pressure = val if isinstance(val, tuple) else (val, None if val is None else 1000.0 + val)
+            records.append({
+                'timestamp': start + i * step,
+                'location': location[i % len(location)] if isinstance(location, tuple) else location,
+                'locationTZ': 'Etc/UTC',
+                'humidity': humidity,
+                'pressure': pressure,
+            })
+
+        return records
+
 
 # =========================================================
 #        G L O B A L   P Y T E S T   F I X T U R E S
@@ -28,6 +50,22 @@ def helpers():
     return Helpers
 
 
+@pytest.fixture()
+def make_records():
+    return Helpers.make_records
+
+
+@pytest.fixture()
+def valid_fields():
+    return {
+        'timestamp':  'strIDX',
+        'location':   'strIDX',
+        'locationTZ': 'strIDX',
+        'humidity':   'float',
+        'pressure':   'float',
+    }
+
+
 @pytest.fixture()
 def default_test_msg(prefix='', suffix='', sep=' '):
     """Create a random test string"""
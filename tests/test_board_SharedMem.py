@@ -0,0 +1,103 @@
+import sys
+import uuid
+import struct
+import subprocess
+import pytest
+
+from libs.sensorMod.src.board_SharedMem import Publisher, Reader, _HEADER_
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+@pytest.fixture()
+def board_name():
+    return f"test_{uuid.uuid4().hex[:12]}"
+
+
+def _make_record(idx):
+    return {
+        'timestamp': f"2021-04-10T21:03:{idx:02d}.123456",
+        'location': 'lab',
+        'locationTZ': 'Etc/UTC',
+        'humidity': 40.0 + idx,
+        'pressure': None,
+    }
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_publish_and_read(valid_fields, board_name):
+    with Publisher(valid_fields, board_name) as board:
+        with Reader(board_name) as reader:
+            assert reader.read() == (0, None)
+            assert reader.fields == valid_fields
+
+            board.publish([_make_record(1), _make_record(2)])
+            seq, rec = reader.read()
+            assert seq == board.sequence == 2
+            assert rec == _make_record(2)
+
+            board.publish(_make_record(3))
+            assert reader.sequence == 4
+            assert reader.read()[1]['humidity'] == 43.0
+
+
+def test_many_readers(valid_fields, board_name):
+    with Publisher(valid_fields, board_name) as board:
+        board.publish(_make_record(5))
+        readers = [Reader(board_name) for _ in range(5)]
+
+        assert all(reader.read()[1] == _make_record(5) for reader in readers)
+        for reader in readers:
+            reader.close()
+
+
+def test_long_strings_truncated(valid_fields, board_name):
+    with Publisher(valid_fields, board_name) as board:
+        with pytest.warns(UserWarning):
+            board.publish({**_make_record(1), 'location': 'x' * 100})
+
+        with Reader(board_name) as reader:
+            assert reader.read()[1]['location'] == 'x' * 63
+
+            # Multi-byte characters are cut on a character boundary
+            board.publish({**_make_record(1), 'location': 'ü' * 40})
+            assert reader.read()[1]['location'] == 'ü' * 31
+
+
+def test_string_slot_size(valid_fields, board_name):
+    with Publisher(valid_fields, board_name, strSize={'location': 200}) as board:
+        board.publish({**_make_record(1), 'location': 'x' * 150})
+
+        with Reader(board_name) as reader:
+            assert reader.read()[1]['location'] == 'x' * 150
+
+    with pytest.raises(ValueError):
+        Publisher(valid_fields, board_name, strSize=300)
+
+
+def test_stale_block_is_replaced(valid_fields, board_name):
+    # Mark block as left behind by a process that has since exited
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    proc.wait()
+    stale = Publisher({'timestamp': 'strIDX', 'temp': 'float'}, board_name)
+    struct.pack_into('<I', stale._buf, _HEADER_.size - 4, proc.pid)
+    stale.close()
+
+    with Publisher(valid_fields, board_name) as board:
+        board.publish(_make_record(1))
+        with Reader(board_name) as reader:
+            assert reader.read()[1] == _make_record(1)
+
+
+def test_live_block_is_not_replaced(valid_fields, board_name):
+    with Publisher(valid_fields, board_name) as board:
+        with pytest.raises(FileExistsError):
+            Publisher(valid_fields, board_name)
+
+        board.publish(_make_record(1))
+        with Reader(board_name) as reader:
+            assert reader.read()[1] == _make_record(1)
@@ -0,0 +1,163 @@
+import json
+import struct
+import random
+import pytest
+
+from libs.sensorMod.src.codec_Binary import Encoder, Decoder
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+@pytest.fixture()
+def imu_fields():
+    return {
+        'timestamp':    'strIDX',
+        'location':     'strIDX',
+        'locationTZ':   'strIDX',
+        'tempDefault':  'float',
+        'humidity':     'float',
+        'pressure':     'float',
+        'orientPitch':  'float',
+        'orientRoll':   'float',
+        'orientYaw':    'float',
+        'compassX':     'float',
+        'compassY':     'float',
+        'compassZ':     'float',
+        'accelX':       'float',
+        'accelY':       'float',
+        'accelZ':       'float',
+        'gyroX':        'float',
+        'gyroY':        'float',
+        'gyroZ':        'float',
+    }
+
+
+def _random_records(fields, num, location='- n/a -'):
+    return [
+        {
+            **{fld: random.uniform(-100, 100) for fld, typ in fields.items() if typ == 'float'},
+            'timestamp': f"2021-04-10T21:03:{i % 60:02d}.{i + 1:06d}",
+            'location': location,
+            'locationTZ': 'Etc/UTC',
+        }
+        for i in range(num)
+    ]
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_round_trip(imu_fields):
+    records = _random_records(imu_fields, 10)
+    records[3]['humidity'] = None
+    records[4]['location'] = None
+
+    data = Encoder(imu_fields, precision='f8').encode(records)
+    assert Decoder().decode(data) == records
+
+
+def test_round_trip_default_precision(imu_fields):
+    records = _random_records(imu_fields, 10)
+
+    decoded = Decoder().decode(Encoder(imu_fields).encode(records))
+    for rec, dec in zip(records, decoded):
+        assert dec['timestamp'] == rec['timestamp']
+        assert dec['pressure'] == pytest.approx(rec['pressure'], rel=1e-6)
+
+
+@pytest.mark.smoke
+def test_streaming(imu_fields):
+    encoder = Encoder(imu_fields)
+    stream = b''.join([
+        encoder.encode(_random_records(imu_fields, 5)),
+        encoder.encode(_random_records(imu_fields, 5, location='attic')),
+        encoder.encode(_random_records(imu_fields, 1)[0]),
+    ])
+
+    # Feed stream in small chunks with frames split across chunks
+    decoder = Decoder()
+    records = []
+    for idx in range(0, len(stream), 7):
+        records += decoder.feed(stream[idx:idx + 7])
+
+    assert len(records) == 11
+    assert [rec['location'] for rec in records[4:7]] == ['- n/a -', 'attic', 'attic']
+
+
+def test_strings_sent_once(imu_fields):
+    encoder = Encoder(imu_fields)
+    first = encoder.encode(_random_records(imu_fields, 1))
+    second = encoder.encode(_random_records(imu_fields, 1))
+    assert len(second) < len(first)
+    assert b'Etc/UTC' in first and b'Etc/UTC' not in second
+
+
+def test_size_vs_json(imu_fields):
+    records = _random_records(imu_fields, 500)
+    encoded = Encoder(imu_fields).encode(records)
+    assert len(json.dumps(records)) >= 5 * len(encoded)
+
+    # One record per 'encode()' (as with '--format binary'), once strings are sent
+    encoder = Encoder(imu_fields)
+    encoder.encode(records[0])
+    for rec in records[1:10]:
+        assert len(json.dumps(rec)) >= 5 * len(encoder.encode(rec))
+
+
+def test_round_trip_openweather():
+    from libs.sensorMod.src.sensor_OpenWeather import _FIELD_MAP_
+
+    record = {
+        'timestamp': '2021-07-12T00:35:49.000001',
+        'location': 'roof',
+        'locationTZ': 'America/New_York',
+        'clouds': 75, 'dew_point': 66.33, 'dt': 1626047749, 'feels_like': 86.61,
+        'humidity': 55, 'pressure': 1016, 'sunrise': 1625998270, 'sunset': 1626050257,
+        'temp': 84.24, 'uvi': 0.07, 'visibility': 10000, 'wind_deg': 220, 'wind_speed': 4.12,
+        'units': 'temperature=F;speed=mph',
+    }
+    assert Decoder().decode(Encoder(_FIELD_MAP_, precision='f8').encode(record)) == [record]
+
+    # Default precision keeps epoch seconds exact
+    decoded = Decoder().decode(Encoder(_FIELD_MAP_).encode(record))[0]
+    assert (decoded['dt'], decoded['sunrise'], decoded['sunset']) == (1626047749, 1625998270, 1626050257)
+    assert decoded['uvi'] == pytest.approx(0.07)
+    assert decoded['units'] == record['units']
+
+
+def test_unknown_schema(imu_fields):
+    encoder = Encoder(imu_fields)
+    encoder.encode(_random_records(imu_fields, 1))
+
+    with pytest.raises(ValueError):
+        Decoder().decode(encoder.encode(_random_records(imu_fields, 1)))
+
+    with pytest.raises(ValueError):
+        Decoder().decode(b'XX\x01\x03\x00\x00\x00\x00')
+
+
+def test_failed_encode_keeps_stream_state(imu_fields):
+    encoder = Encoder(imu_fields)
+    decoder = Decoder()
+    bad = _random_records(imu_fields, 1, location='attic')
+    bad[0]['humidity'] = 'n/a'
+
+    with pytest.raises(struct.error):
+        encoder.encode(bad)
+
+    # Schema and strings from the failed call are sent with the next batch
+    records = _random_records(imu_fields, 2, location='attic')
+    assert [rec['location'] for rec in decoder.feed(encoder.encode(records))] == ['attic', 'attic']
+
+
+def test_unknown_string_code(imu_fields):
+    encoder = Encoder(imu_fields)
+    head = encoder.encode(_random_records(imu_fields, 1))
+    data = encoder.encode(_random_records(imu_fields, 1, location='attic'))
+
+    # Drop strings frame for 'attic', so batch refers to code that decoder hasn't seen
+    batch = data[data.index(b'SM\x01\x03'):]
+    with pytest.raises(ValueError):
+        Decoder().decode(head + batch)
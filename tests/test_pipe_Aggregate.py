@@ -0,0 +1,127 @@
+import statistics
+import pytest
+
+from libs.sensorMod.src.pipe_Aggregate import Aggregator, Sliding, Tumbling, rollup_field_map
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_tumbling_rollups(valid_fields, make_records):
+    vals = [1.0, 2.0, 3.0, 4.0, 10.0, 20.0, None, 30.0, 5.0]
+    aggr = Aggregator(valid_fields, windows=(1,))
+
+    out = aggr.process(make_records(vals, step=0.25))
+    assert len(out) == 2
+    assert out[0]['timestamp'] == '2020-09-13T12:26:40'
+    assert out[0]['location'] == 'lab'
+    assert out[0]['humidityCount'] == 4
+    assert out[0]['humidityMean'] == pytest.approx(2.5)
+    assert out[0]['humidityVar'] == pytest.approx(statistics.pvariance([1, 2, 3, 4]))
+    assert (out[0]['humidityMin'], out[0]['humidityMax'], out[0]['humidityLast']) == (1.0, 4.0, 4.0)
+    assert out[1]['humidityCount'] == 3
+    assert out[1]['humidityLast'] == 30.0
+
+    out = aggr.flush()
+    assert out[0]['humidityCount'] == 1
+    assert aggr.flush() == []
+
+
+def test_multiple_windows(valid_fields, make_records):
+    aggr = Aggregator(valid_fields, windows=(1, 60))
+    out = aggr.process(make_records(range(0, 300), step=0.5))
+
+    assert len([rec for rec in out if rec['window'] == 1.0]) == 149
+    assert len([rec for rec in out if rec['window'] == 60.0]) == 3
+    assert set(aggr.fields) == set(rollup_field_map(valid_fields))
+
+
+@pytest.mark.smoke
+def test_batch_matches_records(valid_fields, make_records):
+    # Pressure is epoch-scale, like OpenWeather 'dt', 'sunrise', and 'sunset'
+    vals = [(float(v % 7), 1600000000.0 + 0.5 * v) for v in range(40)]
+    vals[5] = None
+    records = make_records(vals, step=0.25)
+    columns = {
+        'timestamp': [rec['timestamp'] for rec in records],
+        'humidity': [float('nan') if rec['humidity'] is None else rec['humidity'] for rec in records],
+        'pressure': [float('nan') if rec['pressure'] is None else rec['pressure'] for rec in records],
+    }
+
+    fromRecords = Tumbling(valid_fields, 2)
+    fromBatch = Tumbling(valid_fields, 2)
+    outRec = [r for rec in records for r in fromRecords.update(rec)]
+    outBatch = fromBatch.update_batch(columns)
+    outRec += fromRecords.flush()
+    outBatch += fromBatch.flush()
+
+    assert len(outRec) == len(outBatch) == 5
+    for recA, recB in zip(outRec, outBatch):
+        assert recA['humidityCount'] == recB['humidityCount']
+        assert recA['humidityMean'] == pytest.approx(recB['humidityMean'])
+        assert recA['pressureVar'] == pytest.approx(recB['pressureVar'])
+        assert recA['pressureMax'] == recB['pressureMax']
+
+    pressures = [1600000000.0 + 0.5 * v for v in range(8, 16)]
+    assert outBatch[1]['pressureVar'] == pytest.approx(statistics.pvariance(pressures))
+
+
+@pytest.mark.parametrize('stamps, counts', [
+    ([0.55, 0.6, 0.65, 0.7, 0.75], [1, 2, 2]),
+    ([1600000000.0 + 0.05 * i for i in range(40)], [2] * 20),
+])
+def test_subsecond_windows(stamps, counts):
+    fields = {'timestamp': 'strIDX', 'x': 'float'}
+    fromRecords = Tumbling(fields, 0.1)
+    fromBatch = Tumbling(fields, 0.1)
+    outRec = [r for ts in stamps for r in fromRecords.update({'timestamp': ts, 'x': 1.0})]
+    outBatch = fromBatch.update_batch({'timestamp': stamps, 'x': [1.0] * len(stamps)})
+    outRec += fromRecords.flush()
+    outBatch += fromBatch.flush()
+
+    # Stamps on a window edge (e.g. 0.6) start that window rather than end the previous one.
+    assert outRec == outBatch
+    assert [rec['xCount'] for rec in outBatch] == counts
+
+
+def test_sliding_window(valid_fields, make_records):
+    vals = [5.0, 1.0, 7.0, 3.0, 2.0, 6.0]
+    window = Sliding(valid_fields, width=1.0)
+
+    for rec in make_records(vals, step=0.25):
+        window.update(rec)
+
+    rollup = window.rollup()
+    assert rollup['humidityCount'] == 4
+    assert rollup['humidityMean'] == pytest.approx(statistics.mean(vals[2:]))
+    assert rollup['humidityVar'] == pytest.approx(statistics.pvariance(vals[2:]))
+    assert (rollup['humidityMin'], rollup['humidityMax'], rollup['humidityLast']) == (2.0, 7.0, 6.0)
+
+
+def test_sliding_hop(valid_fields, make_records):
+    window = Sliding(valid_fields, width=2.0, hop=1.0)
+    out = []
+    for rec in make_records(range(12), step=0.5):
+        out += window.update(rec)
+
+    assert len(out) == 5
+    assert all(rec['window'] == 2.0 for rec in out)
+    assert out[0]['timestamp'] == '2020-09-13T12:26:41'
+    assert out[1]['humidityCount'] == 3
+
+
+def test_sliding_hop_gap(valid_fields, make_records):
+    window = Sliding(valid_fields, width=2.0, hop=1.0)
+    records = make_records([1.0, 2.0], step=0.5) + make_records([3.0], start=1600003600.0)
+    out = []
+    for rec in records:
+        out += window.update(rec)
+
+    # Hops at +1 and +2 secs see the pre-gap records, and later hops are skipped.
+    assert [rec['timestamp'] for rec in out] == ['2020-09-13T12:26:41', '2020-09-13T12:26:42']
+    assert [rec['humidityCount'] for rec in out] == [2, 1]
+
+    out = window.update(make_records([4.0], start=1600003601.0)[0])
+    assert [rec['timestamp'] for rec in out] == ['2020-09-13T13:26:41']
+    assert out[0]['humidityCount'] == 1
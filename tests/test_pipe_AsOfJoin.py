@@ -0,0 +1,105 @@
+import pytest
+
+from libs.sensorMod.src.pipe_AsOfJoin import AsOfJoin
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+@pytest.fixture()
+def imu_fields():
+    return {'timestamp': 'strIDX', 'location': 'strIDX', 'accelX': 'float'}
+
+
+@pytest.fixture()
+def weather_fields():
+    return {'timestamp': 'strIDX', 'location': 'strIDX', 'temp': 'float'}
+
+
+_T0_ = 1600000000.0
+
+
+def _imu(offset, val):
+    return {'timestamp': _T0_ + offset, 'location': 'lab', 'accelX': val}
+
+
+def _weather(offset, val):
+    return {'timestamp': _T0_ + offset, 'location': 'roof', 'temp': val}
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_driver_clock(imu_fields, weather_fields):
+    join = AsOfJoin('sensehat')
+    join.add_source('sensehat', imu_fields).add_source('openweather', weather_fields, staleness=600)
+
+    assert join.push('openweather', _weather(0, 21.5)) == []
+    frames = join.push('sensehat', [_imu(0.02, 0.1), _imu(0.04, 0.2)])
+
+    assert len(frames) == 2
+    assert frames[1] == {
+        'timestamp': '2020-09-13T12:26:40.040000',
+        'sensehat.location': 'lab',
+        'sensehat.accelX': 0.2,
+        'sensehat.age': 0.0,
+        'openweather.location': 'roof',
+        'openweather.temp': 21.5,
+        'openweather.age': pytest.approx(0.04),
+    }
+    assert set(frames[0]) == set(join.fields)
+
+
+def test_staleness(imu_fields, weather_fields):
+    join = AsOfJoin('sensehat')
+    join.add_source('sensehat', imu_fields).add_source('openweather', weather_fields, staleness=600)
+
+    join.push('openweather', _weather(0, 21.5))
+    frames = join.push('sensehat', [_imu(599, 0.1), _imu(601, 0.2)])
+    assert frames[0]['openweather.temp'] == 21.5
+    assert frames[1]['openweather.temp'] is None
+    assert frames[1]['openweather.age'] is None
+
+
+def test_lag_waits_for_late_source(imu_fields, weather_fields):
+    join = AsOfJoin('sensehat', lag=1.0)
+    join.add_source('sensehat', imu_fields).add_source('openweather', weather_fields)
+
+    assert join.push('sensehat', [_imu(0.0, 0.1), _imu(0.5, 0.2)]) == []
+    join.push('openweather', _weather(0.25, 21.5))
+
+    frames = join.push('sensehat', _imu(1.5, 0.3))
+    assert [frame['openweather.temp'] for frame in frames] == [None, 21.5]
+    assert len(join.flush()) == 1
+
+
+def test_fixed_period(imu_fields, weather_fields):
+    join = AsOfJoin(1.0, lag=0.5)
+    join.add_source('sensehat', imu_fields).add_source('openweather', weather_fields)
+
+    assert join.push('openweather', _weather(0, 21.5)) == []
+    frames = join.push('sensehat', [_imu(i * 0.25, float(i)) for i in range(13)])
+    assert [frame['sensehat.accelX'] for frame in frames] == [0.0, 4.0, 8.0]
+
+    frames = join.flush()
+    assert [frame['sensehat.accelX'] for frame in frames] == [12.0]
+    assert all(frame['openweather.temp'] == 21.5 for frame in frames)
+
+
+def test_bounded_memory(imu_fields, weather_fields):
+    join = AsOfJoin('openweather', lag=3600, buffer=16)
+    join.add_source('sensehat', imu_fields).add_source('openweather', weather_fields)
+
+    join.push('sensehat', [_imu(i * 0.02, 0.0) for i in range(1000)])
+    assert len(join._sources['sensehat'].buf) == 16
+
+    frames = join.push('openweather', [_weather(i, 20.0) for i in range(20)])
+    assert len(frames) == 4
+    assert len(join._pending) == 16
+
+
+def test_unknown_source(imu_fields):
+    join = AsOfJoin('sensehat').add_source('sensehat', imu_fields)
+    with pytest.raises(KeyError):
+        join.push('speedtest', _imu(0, 0.0))
@@ -0,0 +1,114 @@
+import random
+import pytest
+
+from libs.sensorMod.src.pipe_DeadBand import DeadBand
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+_IMU_FIELDS_ = [f"{kind}{axis}" for kind in ('orient', 'compass', 'accel', 'gyro') for axis in 'XYZ']
+
+
+@pytest.fixture()
+def sensehat_fields():
+    return {
+        'timestamp':    'strIDX',
+        'location':     'strIDX',
+        'locationTZ':   'strIDX',
+        'tempDefault':  'float',
+        'tempHumidity': 'float',
+        'humidity':     'float',
+        'pressure':     'float',
+        **{fld: 'float' for fld in _IMU_FIELDS_},
+    }
+
+
+def _sensehat_records(num, step=10.0, start=1600000000.0):
+    """Slowly drifting environment with sensor noise, and noisy IMU values."""
+    rnd = random.Random(42)
+    records = []
+    for i in range(num):
+        hours = i * step / 3600
+        temp = 21.0 + 0.5 * hours + rnd.gauss(0, 0.02)
+        records.append({
+            'timestamp': start + i * step,
+            'location': 'lab',
+            'locationTZ': 'Etc/UTC',
+            'tempDefault': temp,
+            'tempHumidity': temp + 0.3,
+            'humidity': 40.0 - 1.0 * hours + rnd.gauss(0, 0.05),
+            'pressure': 1013.0 + 0.3 * hours + rnd.gauss(0, 0.01),
+            **{fld: rnd.gauss(0, 0.05) for fld in _IMU_FIELDS_},
+        })
+
+    return records
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_record_mode(valid_fields, make_records):
+    vals = [(40.0, 1000.0), (40.2, 1000.05), (40.6, 1000.05), (40.6, 1000.2), (40.7, 1000.25)]
+    band = DeadBand(valid_fields, {'humidity': 0.5, 'pressure': {'abs': 0.1}})
+
+    out = band.process(make_records(vals))
+    assert [rec['humidity'] for rec in out] == [40.0, 40.6, 40.6]
+    assert out[1] == make_records(vals)[2]
+    assert band.ratio == pytest.approx(3 / 5)
+
+
+@pytest.mark.smoke
+def test_field_mode(valid_fields, make_records):
+    vals = [(40.0, 1000.0), (40.2, 1000.5), (40.9, 1000.55), (40.9, 1000.55)]
+    band = DeadBand(valid_fields, {'humidity': 0.5, 'pressure': 0.1}, mode='field')
+
+    out = band.process(make_records(vals))
+    assert len(out) == 3
+    assert out[1] == {
+        'timestamp': 1600000060.0,
+        'location': 'lab',
+        'locationTZ': 'Etc/UTC',
+        'pressure': 1000.5,
+    }
+    assert 'pressure' not in out[2]
+    assert out[2]['humidity'] == 40.9
+
+
+def test_relative_band(valid_fields, make_records):
+    vals = [(40.0, 1000.0), (40.3, 1000.0), (40.5, 1000.0)]
+    band = DeadBand(valid_fields, {'humidity': {'rel': 0.01}, 'pressure': 0.1})
+
+    out = band.process(make_records(vals))
+    assert [rec['humidity'] for rec in out] == [40.0, 40.5]
+
+
+def test_heartbeat(valid_fields, make_records):
+    vals = [(40.0, 1000.0)] * 12
+    band = DeadBand(valid_fields, {'humidity': 0.5, 'pressure': 0.1}, heartbeat=300)
+
+    out = band.process(make_records(vals))
+    assert [rec['timestamp'] for rec in out] == [1600000000.0, 1600000300.0, 1600000600.0]
+
+
+def test_missing_values(valid_fields, make_records):
+    vals = [(40.0, None), (40.0, None), (40.0, 1000.0)]
+    band = DeadBand(valid_fields, {'humidity': 0.5, 'pressure': 0.1}, heartbeat=None)
+
+    assert len(band.process(make_records(vals))) == 2
+
+
+def test_invalid_mode(valid_fields):
+    with pytest.raises(ValueError):
+        DeadBand(valid_fields, mode='bogus')
+
+
+@pytest.mark.smoke
+def test_default_bands_sensehat(sensehat_fields):
+    records = _sensehat_records(360)
+    band = DeadBand(sensehat_fields)
+
+    out = band.process(records)
+    assert band.ratio <= 0.1
+    assert set(out[-1]) == set(records[-1])
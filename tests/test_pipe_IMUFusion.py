@@ -0,0 +1,111 @@
+import math
+import numpy as np
+import pytest
+
+from libs.sensorMod.src.pipe_IMUFusion import Complementary, tilt, _iir
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+@pytest.fixture()
+def spinning():
+    """Level device turning at 0.5 rad/s, sampled at 100 Hz for 20 secs."""
+    ts = 1600000000.0 + np.arange(2000) * 0.01
+    yaw = 0.5 * (ts - ts[0])
+    zeros = np.zeros(len(ts))
+
+    return {
+        'timestamp': ts,
+        'accelX': zeros,
+        'accelY': zeros,
+        'accelZ': zeros + 1.0,
+        'gyroX': zeros,
+        'gyroY': zeros,
+        'gyroZ': zeros + 0.5,
+        'compassX': 20.0 * np.cos(yaw),
+        'compassY': -20.0 * np.sin(yaw),
+        'compassZ': zeros - 40.0,
+    }
+
+
+def _slice(columns, lo, hi):
+    return {fld: col[lo:hi] for fld, col in columns.items()}
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_iir():
+    u = np.random.default_rng(1).random(5000)
+    expected = []
+    x = 0.5
+    for val in u:
+        x = 0.98 * x + val
+        expected.append(x)
+
+    assert _iir(u, 0.98, 0.5) == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.smoke
+def test_tilt():
+    roll = math.radians(30)
+    pitch, rollOut, yaw = tilt(
+        (np.array([0.0]), np.array([math.sin(roll)]), np.array([math.cos(roll)]))
+    )
+    assert pitch[0] == pytest.approx(0.0)
+    assert rollOut[0] == pytest.approx(roll)
+    assert np.isnan(yaw[0])
+
+
+@pytest.mark.smoke
+def test_process_batch(spinning):
+    orient = Complementary().process_batch(spinning)
+    expected = np.degrees(0.5 * (spinning['timestamp'] - spinning['timestamp'][0])) % 360.0
+
+    assert orient['orientYaw'] == pytest.approx(expected, abs=1e-6)
+    assert orient['orientPitch'] == pytest.approx(np.zeros(2000), abs=1e-6)
+
+
+def test_process_batch_chunks(spinning):
+    full = Complementary().process_batch(spinning)
+
+    fusion = Complementary()
+    parts = [fusion.process_batch(_slice(spinning, lo, lo + 700)) for lo in range(0, 2000, 700)]
+
+    assert np.concatenate([part['orientYaw'] for part in parts]) == pytest.approx(full['orientYaw'])
+
+
+def test_gap_and_missing(spinning):
+    columns = {fld: list(col) for fld, col in spinning.items()}
+    columns['gyroX'][10] = None
+    columns['timestamp'][1000:] = [ts + 60 for ts in columns['timestamp'][1000:]]
+
+    # Noisy gyro, which only affects output until the filter restarts after the gap
+    columns['gyroZ'] = [val + 0.2 for val in columns['gyroZ']]
+
+    orient = Complementary().process_batch(columns)
+    assert np.isnan(orient['orientYaw'][10])
+    assert not np.isnan(orient['orientYaw'][11])
+
+    expected = math.degrees(0.5 * (columns['timestamp'][1000] - columns['timestamp'][0] - 60)) % 360.0
+    assert orient['orientYaw'][1000] == pytest.approx(expected)
+
+
+def test_process_records(spinning):
+    records = [
+        {
+            **{fld: float(col[idx]) for fld, col in spinning.items()},
+            'timestamp': f"2020-09-13T12:26:{idx // 100:02d}.{idx % 100:02d}0000",
+            'location': 'lab',
+        }
+        for idx in range(0, 500, 10)
+    ]
+    records[3].update(accelX=None, accelY=None, accelZ=None)
+
+    data = Complementary().process(records)
+    assert len(data) == 50
+    assert data[0]['location'] == 'lab'
+    assert data[3]['orientYaw'] is None
+    assert data[-1]['orientYaw'] == pytest.approx(math.degrees(0.5 * 4.9))
@@ -0,0 +1,98 @@
+import pytest
+
+from libs.sensorMod.src.pipe_Rules import Rule, RuleEngine
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_threshold_with_hysteresis(valid_fields, make_records):
+    received = []
+    engine = RuleEngine(
+        valid_fields,
+        [Rule('humid', 'humidity > 80', clear='humidity < 75')],
+        notifiers=[received.append]
+    )
+
+    vals = [(70, 1000), (81, 1000), (85, 1000), (78, 1000), (74, 1000), (82, 1000)]
+    alerts = engine.process(make_records(vals))
+
+    assert [(alert['rule'], alert['state']) for alert in alerts] == [
+        ('humid', 'triggered'), ('humid', 'cleared'), ('humid', 'triggered')
+    ]
+    assert alerts[0]['timestamp'] == 1600000060.0
+    assert alerts[0]['record']['humidity'] == 81
+    assert received == alerts
+
+
+@pytest.mark.smoke
+def test_debounce(valid_fields, make_records):
+    engine = RuleEngine(valid_fields, [{'name': 'humid', 'expr': 'humidity > 80', 'debounce': 3}])
+
+    vals = [(81, 1000), (82, 1000), (70, 1000), (81, 1000), (82, 1000), (83, 1000), (84, 1000)]
+    alerts = engine.process(make_records(vals))
+    assert len(alerts) == 1
+    assert alerts[0]['timestamp'] == 1600000000.0 + 5 * 60
+
+
+def test_rate_of_change(valid_fields, make_records):
+    engine = RuleEngine(valid_fields, [
+        Rule('dropping', 'rate(pressure, 600) * 3600 < -3'),
+        Rule('jump', 'abs(delta(pressure)) >= 2'),
+    ])
+
+    vals = [(50, 1000.0 - i * 0.1) for i in range(10)] + [(50, 997.0)]
+    alerts = engine.process(make_records(vals))
+    assert [(alert['rule'], alert['state']) for alert in alerts] == [
+        ('dropping', 'triggered'), ('jump', 'triggered')
+    ]
+
+
+def test_window_stats(valid_fields, make_records):
+    engine = RuleEngine(valid_fields, [Rule('avg', 'mean(humidity, 180) > 60 and count(humidity, 180) >= 3')])
+
+    vals = [(50, 0), (90, 0), (70, 0), (40, 0), (40, 0), (40, 0)]
+    alerts = engine.process(make_records(vals))
+    assert [alert['state'] for alert in alerts] == ['triggered', 'cleared']
+    assert alerts[1]['timestamp'] == 1600000000.0 + 4 * 60
+
+
+def test_missing_values(valid_fields, make_records):
+    engine = RuleEngine(valid_fields, [Rule('humid', 'humidity > 80')])
+    assert engine.process(make_records([(None, 1000)])) == []
+
+
+@pytest.mark.parametrize("expr", [
+    'bogus > 1',
+    '__import__("os")',
+    'humidity.real > 1',
+    'mean(humidity) > 1',
+    'mean(humidity, pressure) > 1',
+    '[humidity][0] > 1',
+    'lambda: 1',
+    'humidity > 1 or "a" * 99999999999999 == ""',
+    "humidity > b''",
+    'humidity > 1j',
+])
+def test_invalid_expressions(valid_fields, expr):
+    with pytest.raises((ValueError, SyntaxError)):
+        RuleEngine(valid_fields, [Rule('bad', expr)])
+
+
+@pytest.mark.parametrize("expr", [
+    'abs(humidity, k=1) > 0',
+    "abs(humidity, k=[c for c in ().__class__.__base__.__subclasses__()][0]) > 0",
+    'abs(*[humidity]) > 0',
+    'rate(humidity, width=60) > 0',
+    'abs(humidity.real) > 0',
+    'abs(humidity.__class__) > 0',
+    'abs([humidity][0]) > 0',
+    'abs({"a": humidity}["a"]) > 0',
+    'abs([c for c in (humidity,)][0]) > 0',
+    'abs(sum(c for c in (humidity,))) > 0',
+])
+def test_builtin_call_is_checked(valid_fields, expr):
+    # Everything inside a builtin call must pass the same checks as the rest of the expression
+    with pytest.raises(ValueError):
+        RuleEngine(valid_fields, [Rule('bad', expr)])
@@ -35,6 +35,24 @@ def _init_sensor(mocker, attribs):
     return sensor
 
 
+def _init_sensor_with_values(mocker, attribs, pressures):
+    """Init sensor with SenseHat driver ('sensor._sensor') mocked to return actual values."""
+    sensor = Sensor(attribs)
+    xyz = {'x': 0.0, 'y': 0.0, 'z': 1.0}
+    mocker.patch.object(sensor._sensor, 'clear')
+    mocker.patch.object(sensor._sensor, 'get_temperature', return_value=21.0)
+    mocker.patch.object(sensor._sensor, 'get_temperature_from_humidity', return_value=21.5)
+    mocker.patch.object(sensor._sensor, 'get_humidity', return_value=40.0)
+    mocker.patch.object(sensor._sensor, 'get_pressure', side_effect=pressures)
+    mocker.patch.object(sensor._sensor, 'get_orientation', return_value={'pitch': 0.0, 'roll': 0.0, 'yaw': 90.0})
+    mocker.patch.object(sensor._sensor, 'get_compass_raw', return_value=xyz)
+    mocker.patch.object(sensor._sensor, 'get_accelerometer_raw', return_value=xyz)
+    mocker.patch.object(sensor._sensor, 'get_gyroscope_raw', return_value=xyz)
+    mocker.patch.object(time, 'sleep')
+
+    return sensor
+
+
 # =========================================================
 #                T E S T   F U N C T I O N S
 # =========================================================
@@ -53,3 +71,69 @@ def test_get_data(mocker, valid_attribs):
     sensor._sensehat.get_compass_raw.assert_called_once()
     sensor._sensehat.get_accelerometer_raw.assert_called_once()
     sensor._sensehat.get_gyroscope_raw.assert_called_once()
+
+
+@pytest.mark.smoke
+def test_get_data_adaptive(mocker, valid_attribs):
+    attribs = valid_attribs
+    attribs['repeat'] = 3
+    attribs['adaptive'] = True
+
+    # Fast pressure change raises rate, so wait between samples gets shorter
+    sensor = _init_sensor_with_values(mocker, attribs, [1000.0, 1010.0, 1020.0])
+
+    data = sensor.get_data()
+    assert len(data) == 3
+    assert data[-1]['sampleRate'] == sensor.rate
+    assert data[-1]['rateReason'] == sensor.rate_reason == 'raised:pressure'
+    assert data[-1]['rateScore'] > 1.0
+    assert time.sleep.call_count == 2
+    assert time.sleep.call_args_list[1][0][0] < time.sleep.call_args_list[0][0][0]
+
+
+def test_rate_controller(valid_attribs):
+    from libs.sensorMod.src.sensor_SenseHat import _RateController, _DEFAULT_SETTINGS_
+
+    ctrl = _RateController({**_DEFAULT_SETTINGS_, 'minRate': 1, 'maxRate': 8, 'settle': 3})
+    assert ctrl.update({'pressure': 1000.0}, 0.0) == 1.0
+
+    # Fast change raises rate up to 'maxRate'
+    ts = 0.0
+    for pressure in (1001.0, 1002.0, 1003.0, 1004.0):
+        ts += 1 / ctrl.rate
+        ctrl.update({'pressure': pressure}, ts)
+    assert ctrl.rate == 8
+    assert ctrl.reason == 'raised:pressure'
+
+    # Stable values lower rate only after 'settle' samples
+    for _ in range(2):
+        ts += 1 / ctrl.rate
+        ctrl.update({'pressure': 1004.0}, ts)
+    assert ctrl.rate == 8
+
+    ts += 1 / ctrl.rate
+    ctrl.update({'pressure': 1004.0}, ts)
+    assert ctrl.rate == 4
+    assert ctrl.reason == 'lowered'
+
+    # Moderate change (between 'lowChange' and 'highChange') holds rate
+    start = ts
+    for _ in range(6):
+        ts += 1 / ctrl.rate
+        ctrl.update({'pressure': 1004.0 + (ts - start) * 0.05}, ts)
+    assert ctrl.rate == 4
+
+
+@pytest.mark.smoke
+def test_get_data_no_orientation(mocker, valid_attribs):
+    attribs = valid_attribs
+    attribs['orientation'] = False
+
+    sensor = _init_sensor_with_values(mocker, attribs, [1000.0])
+
+    data = sensor.get_data()
+    sensor._sensor.get_orientation.assert_not_called()
+    sensor._sensor.get_accelerometer_raw.assert_called_once()
+    sensor._sensor.get_gyroscope_raw.assert_called_once()
+    assert data[0]['orientPitch'] is None
+    assert data[0]['accelZ'] == 1.0
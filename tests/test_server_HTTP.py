@@ -0,0 +1,110 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+
+from libs.sensorMod.src.sensor_base import _SensorBase
+from libs.sensorMod.src.server_HTTP import Server, Collector
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+class _Sensor(_SensorBase):
+    def __init__(self):
+        super().__init__(sensorType='dummy', name='Dummy')
+        self._flds = {'timestamp': 'strIDX', 'location': 'strIDX', 'pressure': 'float'}
+        self.calls = 0
+
+    def reset(self, attribs=None):
+        pass
+
+    def get_data(self, attribs=None):
+        self.calls += 1
+        return [{
+            'timestamp': f"2021-04-10T21:03:{self.calls:02d}",
+            'location': 'lab',
+            'pressure': 1000.0 + self.calls,
+        }]
+
+
+@pytest.fixture()
+def server():
+    collector = Collector(_Sensor(), retention=3)
+    srv = Server([collector], host='127.0.0.1', port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+
+    yield srv, collector
+
+    srv.shutdown()
+    srv.server_close()
+
+
+def _get(srv, path, headers=None):
+    url = f"http://127.0.0.1:{srv.server_address[1]}{path}"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as resp:
+            return resp.status, resp.headers, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, None
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_latest(server):
+    srv, collector = server
+    assert _get(srv, '/latest')[2] == {'dummy': None}
+
+    collector.collect()
+    collector.collect()
+    status, _, body = _get(srv, '/latest?sensor=dummy')
+    assert status == 200
+    assert body['dummy']['pressure'] == 1002.0
+
+
+@pytest.mark.smoke
+def test_conditional_get(server):
+    srv, collector = server
+    collector.collect()
+
+    status, headers, _ = _get(srv, '/latest')
+    assert _get(srv, '/latest', {'If-None-Match': headers['ETag']})[0] == 304
+    assert _get(srv, '/latest', {'If-Modified-Since': headers['Last-Modified']})[0] == 304
+
+    collector.collect()
+    assert _get(srv, '/latest', {'If-None-Match': headers['ETag']})[0] == 200
+
+
+def test_range_and_retention(server):
+    srv, collector = server
+    for _ in range(5):
+        collector.collect()
+
+    body = _get(srv, '/range?start=2021-04-10T21:03:04')[2]
+    assert [rec['pressure'] for rec in body['dummy']] == [1004.0, 1005.0]
+
+    body = _get(srv, '/range')[2]
+    assert len(body['dummy']) == 3
+
+
+def test_stats(server):
+    srv, collector = server
+    for _ in range(3):
+        collector.collect()
+
+    body = _get(srv, '/stats?sensor=dummy')[2]['dummy']
+    assert body['count'] == 3
+    assert body['pressureMean'] == pytest.approx(1002.0)
+    assert body['pressureMax'] == 1003.0
+    assert collector.sensor.calls == 3
+
+
+def test_errors(server):
+    srv, _ = server
+    assert _get(srv, '/bogus')[0] == 404
+    assert _get(srv, '/latest?sensor=bogus')[0] == 404
+    assert _get(srv, '/range?start=yesterday')[0] == 400
@@ -0,0 +1,106 @@
+import os
+import pytest
+
+from libs.sensorMod.src.spool_WAL import Spool
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+def _make_records(make_records, num, start=0):
+    return make_records([6.8 + i for i in range(start, start + num)], start=1600000000.0 + start * 60)
+
+
+class _Sink:
+    def __init__(self, failAfter=None):
+        self.batches = []
+        self.failAfter = failAfter
+
+    def __call__(self, batch):
+        if self.failAfter is not None and len(self.batches) >= self.failAfter:
+            raise ConnectionError('Uplink is down')
+        self.batches.append(batch)
+
+
+def _segments(path):
+    return sorted(fName for fName in os.listdir(path) if fName.endswith('.wal'))
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_put_and_forward(tmp_path, make_records):
+    spool = Spool(str(tmp_path))
+    spool.put(_make_records(make_records, 25))
+
+    sink = _Sink()
+    assert spool.forward(sink, batchSize=10) == 25
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert sink.batches[0][0] == _make_records(make_records, 1)[0]
+    assert spool.pending == 0
+
+    assert spool.forward(sink) == 0
+    spool.close()
+
+
+@pytest.mark.smoke
+def test_forward_resumes_after_failure(tmp_path, make_records):
+    spool = Spool(str(tmp_path))
+    spool.put(_make_records(make_records, 30))
+
+    sink = _Sink(failAfter=1)
+    assert spool.forward(sink, batchSize=10) == 10
+
+    sink.failAfter = None
+    assert spool.forward(sink, batchSize=10) == 20
+    assert [rec['humidity'] for batch in sink.batches for rec in batch] == [6.8 + i for i in range(30)]
+    spool.close()
+
+
+def test_reopen_keeps_cursor(tmp_path, make_records):
+    with Spool(str(tmp_path)) as spool:
+        spool.put(_make_records(make_records, 20))
+        spool.forward(_Sink(), batchSize=5, maxBatches=2)
+
+    sink = _Sink()
+    with Spool(str(tmp_path)) as spool:
+        assert spool.forward(sink) == 10
+        assert sink.batches[0][0]['humidity'] == 6.8 + 10
+
+
+def test_compaction(tmp_path, make_records):
+    spool = Spool(str(tmp_path), segmentSize=512)
+    spool.put(_make_records(make_records, 50))
+    assert len(_segments(tmp_path)) > 2
+
+    spool.forward(_Sink())
+    assert len(_segments(tmp_path)) == 1
+    spool.close()
+
+
+def test_size_cap_drops_oldest(tmp_path, make_records):
+    spool = Spool(str(tmp_path), segmentSize=512, maxBytes=1024)
+    spool.put(_make_records(make_records, 100))
+
+    assert spool.size <= 1024
+    assert spool.dropped > 0
+
+    sink = _Sink()
+    num = spool.forward(sink)
+    assert num + spool.dropped == 100
+    assert sink.batches[-1][-1]['humidity'] == 6.8 + 99
+    spool.close()
+
+
+def test_torn_tail_is_repaired(tmp_path, make_records):
+    with Spool(str(tmp_path)) as spool:
+        spool.put(_make_records(make_records, 3))
+
+    with open(os.path.join(tmp_path, _segments(tmp_path)[-1]), 'ab') as fh:
+        fh.write(b'\x10\x00\x00')
+
+    sink = _Sink()
+    with Spool(str(tmp_path)) as spool:
+        spool.put(_make_records(make_records, 1, start=3))
+        assert spool.forward(sink) == 4
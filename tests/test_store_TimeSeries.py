@@ -0,0 +1,86 @@
+import math
+import pytest
+
+from libs.sensorMod.src.store_TimeSeries import Store
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+def _make_records(make_records, num, start=0):
+    # Pressure is missing at index 3, and location alternates between 'attic' and 'lab'.
+    vals = [(40.0 + i, None if i == 3 else 1000.0 + i) for i in range(start, start + num)]
+    return make_records(vals, step=1.0, start=1600000000.0 + start, location=('attic', 'lab'))
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+def test_ingest_and_scan(tmp_path, valid_fields, make_records):
+    store = Store(str(tmp_path), valid_fields, blockSize=4)
+    assert store.ingest(_make_records(make_records, 10)) == 10
+    assert len(store) == 10
+
+    data = store.scan(1600000002, 1600000007, ['humidity', 'pressure', 'location'])
+    assert list(data['timestamp']) == [float(1600000000 + i) for i in range(2, 7)]
+    assert list(data['humidity']) == [42.0, 43.0, 44.0, 45.0, 46.0]
+    assert math.isnan(data['pressure'][1])
+    assert store.decode('location', data['location']) == ['attic', 'lab', 'attic', 'lab', 'attic']
+    assert data['humidity'].readonly
+
+    store.close()
+
+
+@pytest.mark.smoke
+def test_scan_iso_timestamps(tmp_path, valid_fields, make_records):
+    store = Store(str(tmp_path), valid_fields)
+    store.ingest(_make_records(make_records, 5))
+
+    data = store.scan('2020-09-13T12:26:41', None)
+    assert len(data['timestamp']) == 4
+    assert len(store.scan(None, 1600000000)['timestamp']) == 0
+
+    store.close()
+
+
+def test_reopen_and_append(tmp_path, valid_fields, make_records):
+    with Store(str(tmp_path), valid_fields, blockSize=4) as store:
+        store.ingest(_make_records(make_records, 6))
+
+    with Store(str(tmp_path)) as store:
+        assert len(store) == 6
+        store.ingest(_make_records(make_records, 6, start=6))
+        assert len(store.scan(1600000005, 1600000009)['timestamp']) == 4
+        assert store.strings('location') == [None, 'attic', 'lab']
+
+
+def test_out_of_order(tmp_path, valid_fields, make_records):
+    store = Store(str(tmp_path), valid_fields)
+    store.ingest(_make_records(make_records, 2, start=5))
+
+    with pytest.raises(ValueError):
+        store.ingest(_make_records(make_records, 1))
+
+    assert len(store) == 2
+    store.close()
+
+
+def test_recover_partial_ingest(tmp_path, valid_fields, make_records):
+    with Store(str(tmp_path), valid_fields) as store:
+        store.ingest(_make_records(make_records, 3))
+
+    # Simulate crash after some columns were written
+    with open(tmp_path / 'humidity.f64', 'ab') as fh:
+        fh.write(b'\x00' * 12)
+
+    with Store(str(tmp_path)) as store:
+        assert len(store) == 3
+        assert list(store.scan()['humidity']) == [40.0, 41.0, 42.0]
+
+
+def test_field_map_mismatch(tmp_path, valid_fields):
+    Store(str(tmp_path), valid_fields).close()
+
+    with pytest.raises(ValueError):
+        Store(str(tmp_path), {'timestamp': 'strIDX', 'temp': 'float'})
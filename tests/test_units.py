@@ -0,0 +1,92 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from libs.sensorMod.src.units import convert, convert_columns, convert_records, format_units, parse_units
+
+
+# =========================================================
+#     G L O B A L S   &   P Y T E S T   F I X T U R E S
+# =========================================================
+@pytest.fixture()
+def unit_map():
+    return {'tempDefault': 'C', 'tempHumidity': 'C', 'pressure': 'hPa', 'humidity': '%'}
+
+
+@pytest.fixture()
+def valid_records(unit_map):
+    units = format_units(unit_map)
+    return [
+        {'timestamp': '2021-04-10T21:03:38', 'tempDefault': 0.0, 'pressure': 1013.25, 'humidity': 40.0, 'units': units},
+        {'timestamp': '2021-04-10T21:03:39', 'tempDefault': 100.0, 'pressure': None, 'humidity': 41.0, 'units': units},
+    ]
+
+
+# =========================================================
+#                T E S T   F U N C T I O N S
+# =========================================================
+@pytest.mark.smoke
+@pytest.mark.parametrize("val, fromUnit, toUnit, expected", [
+    (100.0, 'C', 'F', 212.0),
+    (32.0, 'F', 'C', 0.0),
+    (0.0, 'C', 'K', 273.15),
+    (212.0, 'F', 'K', 373.15),
+    (1013.25, 'hPa', 'inHg', 29.9213),
+    (10.0, 'm/s', 'km/h', 36.0),
+    (10.0, 'mph', 'm/s', 4.4704),
+    (8e6, 'bit/s', 'byte/s', 1e6),
+    (8e6, 'bit/s', 'Mbit/s', 8.0),
+])
+def test_convert_scalar(val, fromUnit, toUnit, expected):
+    assert convert(val, fromUnit, toUnit) == pytest.approx(expected, rel=1e-5)
+
+
+def test_convert_columns_types():
+    assert convert([0.0, None, 100.0], 'C', 'F') == [32.0, None, 212.0]
+    assert convert(array('d', [0.0, 100.0]), 'C', 'F') == array('d', [32.0, 212.0])
+    assert np.allclose(convert(np.array([0.0, 100.0]), 'C', 'F'), [32.0, 212.0])
+
+    col = [1.0, 2.0]
+    assert convert(col, 'hPa', 'hPa') is col
+
+
+def test_convert_invalid():
+    with pytest.raises(ValueError):
+        convert(1.0, 'C', 'hPa')
+
+    with pytest.raises(ValueError):
+        convert(1.0, 'C', 'bogus')
+
+
+def test_format_units(unit_map):
+    assert format_units(unit_map) == 'temperature=C;pressure=hPa'
+    assert parse_units('temperature=C;pressure=hPa') == {'temperature': 'C', 'pressure': 'hPa'}
+
+    with pytest.raises(ValueError):
+        format_units({'tempDefault': 'C', 'tempHumidity': 'F'})
+
+
+@pytest.mark.smoke
+def test_convert_records(valid_records, unit_map):
+    out = convert_records(valid_records, {'temperature': 'F', 'pressure': 'inHg'}, unit_map)
+
+    assert [rec['tempDefault'] for rec in out] == pytest.approx([32.0, 212.0])
+    assert out[0]['pressure'] == pytest.approx(29.9213, rel=1e-5)
+    assert out[1]['pressure'] is None
+    assert out[0]['humidity'] == 40.0
+    assert out[0]['units'] == 'temperature=F;pressure=inHg'
+
+    # Originals are left alone, and converting again is a no-op
+    assert valid_records[0]['tempDefault'] == 0.0
+    assert convert_records(out, {'temperature': 'F'}, unit_map) == out
+
+
+def test_convert_columns():
+    columns = {'tempDefault': array('d', [0.0, 10.0]), 'pressure': [1000.0, 1010.0]}
+    unitMap = {'tempDefault': 'C', 'pressure': 'hPa'}
+
+    out, outUnits = convert_columns(columns, unitMap, {'tempDefault': 'K'})
+    assert list(out['tempDefault']) == pytest.approx([273.15, 283.15])
+    assert out['pressure'] is columns['pressure']
+    assert outUnits == {'tempDefault': 'K', 'pressure': 'hPa'}